@@ -1,3 +1,15 @@
+import os
+
 from setuptools import setup
 
-setup()
+ext_modules = []
+# Set PYLOX_USE_MYPYC=1 to compile the frontend (lexer, parser and resolver) into
+# C extensions with mypyc. Without it, the pure Python modules are used.
+if os.environ.get("PYLOX_USE_MYPYC") == "1":
+    from mypyc.build import mypycify
+
+    ext_modules = mypycify(
+        ["src/pylox/lexer.py", "src/pylox/parser.py", "src/pylox/resolver.py"]
+    )
+
+setup(ext_modules=ext_modules)
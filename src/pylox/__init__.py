@@ -3,7 +3,9 @@ from __future__ import annotations
 
 import argparse
 import os.path
+import sys
 import traceback
+from functools import lru_cache
 from typing import Sequence
 
 from pylox.errors import LoxError
@@ -35,7 +37,9 @@ class PyloxArgs(argparse.Namespace):
     filename: str
 
 
-def main(argv: list[str] | None = None) -> None:
+@lru_cache(maxsize=None)
+def get_argument_parser() -> argparse.ArgumentParser:
+    """Builds the argument parser once, so repeated calls to `main` reuse it."""
     parser = argparse.ArgumentParser()
     parser.add_argument(
         "-i",
@@ -49,6 +53,13 @@ def main(argv: list[str] | None = None) -> None:
         help="Print a stack trace when a crash occurs",
     )
     parser.add_argument("filename", help="Name of file to run", nargs="?")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = get_argument_parser()
+    # Argparse only picks the program name from argv when it is created
+    parser.prog = os.path.basename(sys.argv[0])
     args = parser.parse_args(argv, namespace=PyloxArgs())
 
     if args.filename is None:
@@ -142,8 +153,11 @@ def run(
         pretty_print_error(source, filename, exc)
         return 1
 
-    parser = Parser(tokens)
-    tree, errors = parser.parse()
+    tree, errors = Parser(tokens).parse()
+    # The tree holds on to every token it needs, so drop the full token
+    # list to keep it from staying alive while the program runs.
+    del tokens
+
     if errors:
         if len(errors) > 1:
             pretty_print_errors(source, filename, errors)
@@ -4,7 +4,7 @@ import time
 
 from pylox.environment import Environment, EnvironmentLookupError
 from pylox.errors import LoxError
-from pylox.lox_types import Boolean, Float, Integer, LoxType, String
+from pylox.lox_types import Float, Integer, LoxType, String
 from pylox.nodes import (
     Assignment,
     Binary,
@@ -89,11 +89,19 @@ class Input:
         return 1
 
 
+# Native functions hold no state, so every interpreter shares the same ones
+NATIVE_FUNCTIONS: dict[str, LoxType] = {
+    "clock": NativeClock(),
+    "dir": Dir(),
+    "input": Input(),
+}
+
+
 def create_globals() -> Environment:
     globals = Environment()
-    globals.define("clock", NativeClock())
-    globals.define("dir", Dir())
-    globals.define("input", Input())
+    for name, function in NATIVE_FUNCTIONS.items():
+        globals.define(name, function)
+
     return globals
 
 
@@ -254,11 +262,10 @@ class Interpreter(Visitor[LoxType]):
         return literal.value
 
     def visit_Unary(self, unary: Unary) -> LoxType:
-        if unary.operator.token_type == TokenType.MINUS:
+        if unary.operator.token_type is TokenType.MINUS:
             right_value = self.evaluate(unary.right)
-            if isinstance(right_value, Boolean) or not isinstance(
-                right_value, (Integer, Float)
-            ):
+            # Exact type checks, as booleans are ints in Python
+            if type(right_value) is not Integer and type(right_value) is not Float:
                 value_type = get_lox_type_name(right_value)
                 raise InterpreterError(
                     f"Expected 'Integer' or 'Float' for unary '-', got {value_type!r}",
@@ -267,7 +274,7 @@ class Interpreter(Visitor[LoxType]):
 
             return -right_value
 
-        if unary.operator.token_type == TokenType.BANG:
+        if unary.operator.token_type is TokenType.BANG:
             right_value = self.evaluate(unary.right)
             if is_truthy(right_value):
                 return False
@@ -283,9 +290,9 @@ class Interpreter(Visitor[LoxType]):
         left_value = self.evaluate(binary.left)
 
         # Short circuited operators: `and` and `or`, can return early
-        if binary.operator.token_type == TokenType.OR and is_truthy(left_value):
+        if binary.operator.token_type is TokenType.OR and is_truthy(left_value):
             return left_value
-        if binary.operator.token_type == TokenType.AND and not is_truthy(left_value):
+        if binary.operator.token_type is TokenType.AND and not is_truthy(left_value):
             return left_value
 
         right_value = self.evaluate(binary.right)
@@ -294,46 +301,45 @@ class Interpreter(Visitor[LoxType]):
         if binary.operator.token_type in (TokenType.AND, TokenType.OR):
             return right_value
 
-        if binary.operator.token_type == TokenType.EQUAL_EQUAL:
+        if binary.operator.token_type is TokenType.EQUAL_EQUAL:
             return left_value == right_value
-        if binary.operator.token_type == TokenType.BANG_EQUAL:
+        if binary.operator.token_type is TokenType.BANG_EQUAL:
             return left_value != right_value
 
         if (
-            isinstance(left_value, str)
-            and isinstance(right_value, str)
-            and binary.operator.token_type == TokenType.PLUS
+            type(left_value) is str
+            and type(right_value) is str
+            and binary.operator.token_type is TokenType.PLUS
         ):
             return left_value + right_value
 
         if isinstance(left_value, (Integer, Float)) and isinstance(
             right_value, (Integer, Float)
         ):
-            if binary.operator.token_type == TokenType.PLUS:
+            if binary.operator.token_type is TokenType.PLUS:
                 return left_value + right_value
-            if binary.operator.token_type == TokenType.MINUS:
+            if binary.operator.token_type is TokenType.MINUS:
                 return left_value - right_value
-            if binary.operator.token_type == TokenType.STAR:
+            if binary.operator.token_type is TokenType.STAR:
                 return left_value * right_value
-            if binary.operator.token_type == TokenType.STARSTAR:
-                # typeshed bug: https://github.com/python/typeshed/pull/7682
-                return left_value**right_value  # type: ignore
-            if binary.operator.token_type == TokenType.SLASH:
+            if binary.operator.token_type is TokenType.STARSTAR:
+                return left_value**right_value
+            if binary.operator.token_type is TokenType.SLASH:
                 if right_value == 0:
                     raise InterpreterError("Division by zero", binary.right)
                 return left_value / right_value
-            if binary.operator.token_type == TokenType.PERCENT:
+            if binary.operator.token_type is TokenType.PERCENT:
                 return left_value % right_value
-            if binary.operator.token_type == TokenType.BACKSLASH:
+            if binary.operator.token_type is TokenType.BACKSLASH:
                 return left_value // right_value
 
-            if binary.operator.token_type == TokenType.GREATER:
+            if binary.operator.token_type is TokenType.GREATER:
                 return left_value > right_value
-            if binary.operator.token_type == TokenType.GREATER_EQUAL:
+            if binary.operator.token_type is TokenType.GREATER_EQUAL:
                 return left_value >= right_value
-            if binary.operator.token_type == TokenType.LESS:
+            if binary.operator.token_type is TokenType.LESS:
                 return left_value < right_value
-            if binary.operator.token_type == TokenType.LESS_EQUAL:
+            if binary.operator.token_type is TokenType.LESS_EQUAL:
                 return left_value <= right_value
 
         raise InterpreterError(
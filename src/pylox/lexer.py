@@ -1,10 +1,39 @@
 from __future__ import annotations
 
+import re
+import string
 import sys
+from typing import Callable
 
 from pylox.errors import LoxError
 from pylox.lox_types import Float, Integer, LoxType
-from pylox.tokens import EOF, KEYWORD_TOKENS, Token, TokenType
+from pylox.tokens import (
+    EOF,
+    KEYWORD_TOKENS,
+    OPERATOR_TOKENS,
+    SINGLE_CHAR_TOKENS,
+    Token,
+    TokenType,
+)
+
+# The rest of an identifier or a number, after its first character.
+IDENTIFIER_REST_RE = re.compile(r"\w*")
+NUMBER_REST_RE = re.compile(r"\d*(\.\d+)?")
+# Runs of characters in a string that aren't the closing quote or a backslash.
+STRING_PLAIN_CHARS_RE = {
+    '"': re.compile(r'[^"\\]*'),
+    "'": re.compile(r"[^'\\]*"),
+}
+# What each character after a backslash in a string stands for. A trailing
+# backslash means ignore the newline.
+STRING_ESCAPES = {
+    "\n": "",
+    "\\": "\\",
+    "n": "\n",
+    "t": "\t",
+    "'": "'",
+    '"': '"',
+}
 
 
 class LexError(LoxError):
@@ -17,40 +46,29 @@ class LexIncompleteError(LexError):
 
 class Lexer:
     def __init__(self, source: str) -> None:
-        self.source = source
+        # A NUL sentinel at the end lets the scanners look one character
+        # ahead without checking bounds. It is never part of any token, as
+        # it isn't a digit, letter or quote. A NUL before `length` is a
+        # genuine character from the source.
+        self.source = source + "\0"
+        self.length = len(source)
         self.tokens: list[Token] = []
+        # Bound once, as it's called for every token
+        self.append_token = self.tokens.append
         # Start and current represent the two ends of the current token
         self.start = self.current = 0
 
         self.scan_tokens()
 
-    @property
-    def scanned(self) -> int:
-        """Returns True if the source has been fully scanned."""
-        return self.current >= len(self.source)
-
     def advance(self) -> None:
         """Advance the current pointer."""
         self.current += 1
 
-    def peek(self) -> str:
-        """Returns the current character, without actually consuming it."""
-        if self.scanned:
-            return ""
-
-        return self.source[self.current]
-
-    def peek_next(self) -> str:
-        """Returns the next character, without actually consuming it."""
-        if self.current + 1 >= len(self.source):
-            return ""
-
-        return self.source[self.current + 1]
-
     def read_char(self) -> str:
         """
         Reads one character from the source.
-        If the source has been exhausted, returns an empty string.
+        At the end of the source, returns the NUL sentinel. Reading past the
+        sentinel raises an IndexError.
         """
         char = self.source[self.current]
         # current will always point at the next character to read.
@@ -63,9 +81,6 @@ class Lexer:
         Returns True and reads one character from source, but only if it
         matches the given character. Returns False otherwise.
         """
-        if self.scanned:
-            return False
-
         if self.source[self.current] == char:
             self.advance()
             return True
@@ -75,13 +90,17 @@ class Lexer:
     def add_token(self, token_type: TokenType, value: LoxType = None) -> None:
         """Adds a new token for the just-scanned characters."""
         string = self.source[self.start : self.current]
-        self.tokens.append(Token(token_type, string, value, self.start))
+        # Even operators and keywords get a new Token each time, as every token
+        # records its own index, for error messages and AST node locations.
+        self.append_token(Token(token_type, string, value, self.start))
         self.start = self.current
 
     def scan_tokens(self) -> list[Token]:
         """Scans the source to produce tokens of variables, operators, strings etc."""
-        while not self.scanned:
-            self.scan_token()
+        length = self.length
+        scan_token = self.scan_token
+        while self.current < length:
+            scan_token()
 
         self.tokens.append(EOF)
         return self.tokens
@@ -89,171 +108,133 @@ class Lexer:
     def scan_token(self) -> None:
         char = self.read_char()
 
-        if char in (" ", "\t", "\r", "\n"):
-            # Ignore whitespace
-            self.start += 1
-
-        elif char == "(":
-            self.add_token(TokenType.LEFT_PAREN)
-        elif char == ")":
-            self.add_token(TokenType.RIGHT_PAREN)
-        elif char == "{":
-            self.add_token(TokenType.LEFT_BRACE)
-        elif char == "}":
-            self.add_token(TokenType.RIGHT_BRACE)
-        elif char == ",":
-            self.add_token(TokenType.COMMA)
-        elif char == ".":
-            self.add_token(TokenType.DOT)
-        elif char == ";":
-            self.add_token(TokenType.SEMICOLON)
-        elif char == "+":
-            self.add_token(TokenType.PLUS)
-        elif char == "-":
-            self.add_token(TokenType.MINUS)
-        elif char == "*":
-            if self.match_next("*"):
-                self.add_token(TokenType.STARSTAR)
-            else:
-                self.add_token(TokenType.STAR)
-        elif char == "%":
-            self.add_token(TokenType.PERCENT)
-        elif char == "\\":
-            self.add_token(TokenType.BACKSLASH)
-
-        elif char == "/":
-            if self.match_next("/"):
-                self.scan_comment()
-            else:
-                self.add_token(TokenType.SLASH)
-
-        elif char == "=":
-            if self.match_next("="):
-                self.add_token(TokenType.EQUAL_EQUAL)
-            else:
-                self.add_token(TokenType.EQUAL)
-
-        elif char == "!":
-            if self.match_next("="):
-                self.add_token(TokenType.BANG_EQUAL)
-            else:
-                self.add_token(TokenType.BANG)
-
-        elif char == "<":
-            if self.match_next("="):
-                self.add_token(TokenType.LESS_EQUAL)
-            else:
-                self.add_token(TokenType.LESS)
-
-        elif char == ">":
-            if self.match_next("="):
-                self.add_token(TokenType.GREATER_EQUAL)
-            else:
-                self.add_token(TokenType.GREATER)
-
-        elif char in ('"', "'"):
-            self.scan_string(char)
+        token_type = SINGLE_CHAR_TOKENS.get(char)
+        if token_type is not None:
+            self.add_token(token_type)
+            return
+
+        scanner = CHAR_SCANNERS.get(char)
+        if scanner is not None:
+            scanner(self)
 
+        # Non-ASCII digits and letters aren't in the scanner table
         elif char.isdigit():
             self.scan_number()
 
-        elif char.isalpha() or char == "_":
+        elif char.isalpha():
             self.scan_identifier()
 
         else:
             raise LexError(f"Unknown character found: '{char}'", self.start)
 
+    def skip_whitespace(self) -> None:
+        self.start += 1
+
+    def scan_operator(self) -> None:
+        """Scans operators that may be followed by a second character."""
+        second_char, token_type, long_token_type = OPERATOR_TOKENS[
+            self.source[self.start]
+        ]
+        if self.match_next(second_char):
+            self.add_token(long_token_type)
+        else:
+            self.add_token(token_type)
+
+    def scan_slash(self) -> None:
+        if self.match_next("/"):
+            self.scan_comment()
+        else:
+            self.add_token(TokenType.SLASH)
+
     def scan_comment(self) -> None:
         """Reads and discards a comment. A comment goes on till a newline."""
-        while not self.scanned and self.peek() != "\n":
-            self.advance()
+        newline = self.source.find("\n", self.current)
+        self.current = self.length if newline == -1 else newline
 
         # Since comments are thrown away, reset the start pointer
         self.start = self.current
 
     def scan_identifier(self) -> None:
         """Scans keywords and variable names."""
-        while not self.scanned and (self.peek().isalnum() or self.peek() == "_"):
-            self.advance()
+        # The first character has already been read
+        match = IDENTIFIER_REST_RE.match(self.source, self.current)
+        assert match is not None  # The pattern also matches the empty string
+        self.current = match.end()
 
-        identifier = self.source[self.start : self.current]
+        # Interned, as names end up as dictionary keys in every scope lookup.
+        identifier = sys.intern(self.source[self.start : self.current])
 
-        if identifier in KEYWORD_TOKENS:
-            token_type = KEYWORD_TOKENS[identifier]
-            self.add_token(token_type)
-        else:
-            self.add_token(TokenType.IDENTIFIER)
+        token_type = KEYWORD_TOKENS.get(identifier, TokenType.IDENTIFIER)
+        self.append_token(Token(token_type, identifier, index=self.start))
+        self.start = self.current
+
+    def scan_string(self) -> None:
+        source = self.source
+        quote_char = source[self.start]
+        plain_chars_re = STRING_PLAIN_CHARS_RE[quote_char]
 
-    def scan_string(self, quote_char: str) -> None:
-        unescaped_chars = []
+        chunks = []
+        index = self.current
         while True:
-            char = self.peek()
-            if char == "":
+            # Everything up to the next quote or backslash is taken as is.
+            # endpos keeps the match from running into the NUL sentinel.
+            match = plain_chars_re.match(source, index, self.length)
+            assert match is not None  # The pattern also matches the empty string
+            end = match.end()
+            chunks.append(source[index:end])
+
+            if end >= self.length:
                 # Happens in interactive mode, when writing multiline
                 # strings. Treat it as EOF.
                 raise LexIncompleteError("Unterminated string", index=self.start)
 
-            self.advance()
-
-            if char == quote_char:
+            if source[end] == quote_char:
+                index = end + 1
                 break
 
-            if char != "\\":
-                unescaped_chars.append(char)
-                continue
-
             # Escaping the next character
-            next_char = self.peek()
-            if next_char == "":
+            if end + 1 >= self.length:
                 raise LexIncompleteError("Unterminated string", index=self.start)
 
-            if next_char == "\n":
-                pass  # trailing backslash means ignore the newline
-            elif next_char == "\\":
-                unescaped_chars.append("\\")
-            elif next_char == "n":
-                unescaped_chars.append("\n")
-            elif next_char == "t":
-                unescaped_chars.append("\t")
-            elif next_char == "'":
-                unescaped_chars.append("'")
-            elif next_char == '"':
-                unescaped_chars.append('"')
-            else:
-                escape = char + next_char
+            next_char = source[end + 1]
+
+            escaped = STRING_ESCAPES.get(next_char)
+            if escaped is None:
+                escape = "\\" + next_char
                 raise LexError(
                     f"Unknown escape sequence: '{escape}'",
-                    index=self.current,
+                    index=end + 1,
                 )
 
-            self.advance()
+            chunks.append(escaped)
+            index = end + 2
 
-        string = "".join(unescaped_chars)
+        self.current = index
+        string = "".join(chunks)
         self.add_token(TokenType.STRING, string)
 
     def scan_number(self) -> None:
         """Returns an Integer or Float token."""
-        is_float = False
-
-        while self.peek().isdigit():
-            self.advance()
-
-        # decimal support
-        if self.peek() == ".":
-            if self.peek_next().isdigit():
-                is_float = True
-                self.advance()
-                while self.peek().isdigit():
-                    self.advance()
+        # The first digit has already been read
+        match = NUMBER_REST_RE.match(self.source, self.current)
+        assert match is not None  # The pattern also matches the empty string
+        self.current = match.end()
 
+        is_float = match.group(1) is not None
+        string = self.source[self.start : self.current]
         if is_float:
-            token = Float(self.source[self.start : self.current])
-            self.add_token(TokenType.FLOAT, token)
+            self.add_token(TokenType.FLOAT, Float(string))
         else:
-            token = Integer(self.source[self.start : self.current])
-            self.add_token(TokenType.INTEGER, token)
-
-
-if __name__ == "__main__":
-    _source = " ".join(sys.argv[1:])
-    print(Lexer(_source).tokens)
+            self.add_token(TokenType.INTEGER, Integer(string))
+
+
+# What to scan next, for every ASCII character that isn't a token by itself.
+CHAR_SCANNERS: dict[str, Callable[[Lexer], None]] = {
+    **dict.fromkeys(" \t\r\n", Lexer.skip_whitespace),
+    **dict.fromkeys(OPERATOR_TOKENS, Lexer.scan_operator),
+    "/": Lexer.scan_slash,
+    '"': Lexer.scan_string,
+    "'": Lexer.scan_string,
+    **dict.fromkeys(string.digits, Lexer.scan_number),
+    **dict.fromkeys(string.ascii_letters + "_", Lexer.scan_identifier),
+}
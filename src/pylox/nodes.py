@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Sequence
+from typing import Iterable, Sequence
 
 from attr import define, field
 
@@ -8,76 +8,86 @@ from pylox.lox_types import LoxType
 from pylox.tokens import Token
 
 
+def _expr_tuple(exprs: Iterable[Expr]) -> tuple[Expr, ...]:
+    return tuple(exprs)
+
+
+# All nodes must be defined with attrs' `define`, which makes them slotted:
+# their fields are read all the time while walking and visiting the tree.
 @define(kw_only=True, frozen=True)
 class Node:
     index: int = field(default=-1, repr=False)
 
 
-@define
+# Expressions are used as dictionary keys by the interpreter, to find the
+# scope depth of each variable. Caching their hash means a subtree only gets
+# hashed once, instead of on every lookup.
+@define(cache_hash=True)
 class Expr(Node):
     ...
 
 
-@define
+@define(cache_hash=True)
 class Literal(Expr):
     value: LoxType
 
 
-@define
+@define(cache_hash=True)
 class Variable(Expr):
     name: Token
 
 
-@define
+@define(cache_hash=True)
 class Assignment(Expr):
     name: Token
     value: Expr
 
 
-@define
+@define(cache_hash=True)
 class Unary(Expr):
     operator: Token
     right: Expr
 
 
-@define
+@define(cache_hash=True)
 class Binary(Expr):
     left: Expr
     operator: Token
     right: Expr
 
 
-@define
+@define(cache_hash=True)
 class Grouping(Expr):
     expression: Expr
 
 
-@define
+@define(cache_hash=True)
 class Call(Expr):
     callee: Expr
     paren: Token  # to store the location of the bracket, for error reporting
-    arguments: Sequence[Expr] = ()
+    # A tuple, so that calls are hashable like every other expression
+    arguments: Sequence[Expr] = field(default=(), converter=_expr_tuple)
 
 
-@define
+@define(cache_hash=True)
 class Get(Expr):
     object: Expr
     name: Token
 
 
-@define
+@define(cache_hash=True)
 class Set(Expr):
     object: Expr
     name: Token
     value: Expr
 
 
-@define
+@define(cache_hash=True)
 class This(Expr):
     keyword: Token
 
 
-@define
+@define(cache_hash=True)
 class Super(Expr):
     keyword: Token
     method: Variable
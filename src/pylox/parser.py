@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import sys
+from bisect import bisect_right
 from typing import TYPE_CHECKING, overload
 
 if TYPE_CHECKING:
@@ -37,6 +38,47 @@ from pylox.nodes import (
 from pylox.tokens import EOF, Token, TokenType
 
 
+# Binary operators for each of the rules from logical_or to factor, from the
+# loosest binding to the tightest.
+BINARY_OPERATORS = (
+    frozenset({TokenType.OR}),
+    frozenset({TokenType.AND}),
+    frozenset({TokenType.BANG_EQUAL, TokenType.EQUAL_EQUAL}),
+    frozenset(
+        {
+            TokenType.GREATER,
+            TokenType.GREATER_EQUAL,
+            TokenType.LESS,
+            TokenType.LESS_EQUAL,
+        }
+    ),
+    frozenset({TokenType.PLUS, TokenType.MINUS}),
+    frozenset(
+        {
+            TokenType.STAR,
+            TokenType.SLASH,
+            TokenType.PERCENT,
+            TokenType.BACKSLASH,
+        }
+    ),
+)
+# The precedence level of each binary operator, its index in the tuple above.
+BINARY_PRECEDENCE = {
+    token_type: level
+    for level, operators in enumerate(BINARY_OPERATORS)
+    for token_type in operators
+}
+
+# Tokens that can follow a primary expression: a call or a property access.
+POSTFIX_OPERATORS = frozenset({TokenType.LEFT_PAREN, TokenType.DOT})
+
+# Tokens that end a statement, where error recovery resumes parsing.
+SYNC_TOKENS = frozenset({TokenType.SEMICOLON, TokenType.RIGHT_BRACE})
+
+# Tokens that become a Literal holding the token's value.
+LITERAL_TOKENS = frozenset({TokenType.STRING, TokenType.INTEGER, TokenType.FLOAT})
+
+
 class ParseError(LoxError):
     def __init__(self, message: str, token: Token) -> None:
         super().__init__(message, token.index)
@@ -93,59 +135,66 @@ class Parser:
                  | "(" expression ")"
                  | IDENTIFIER
                  | "super" "." IDENTIFIER
+
+    The grammar needs one token of lookahead at most, so the parser never
+    backtracks and never parses the same position twice. Because of that,
+    the parse methods are deliberately not memoized: a packrat style cache
+    would only add overhead. The one try/except in parse() is for error
+    recovery, not for speculative parsing.
     """
 
     def __init__(self, tokens: list[Token]) -> None:
         if len(tokens) == 0:
             raise ValueError("Cannot parse empty list of tokens")
 
+        # An identity check on the type, instead of comparing every field
+        # of the last token with EOF
         last_token = tokens[-1]
-        if last_token != EOF:
+        if last_token.token_type is not TokenType.EOF:
             token_type = last_token.token_type.value
             raise ValueError(f"Expected EOF as the last token, found {token_type!r}")
 
         self.tokens = tokens
+        # The token fields the parser reads most, as parallel lists. The full
+        # tokens are still used for the AST and for error messages.
+        self.token_types = [token.token_type for token in tokens]
+        self.token_values = [token.value for token in tokens]
+        self.token_indices = [token.index for token in tokens]
+        # Index of the EOF token. The parser only ever advances past tokens
+        # it has matched, so the index never goes beyond this point.
+        self.end = len(tokens) - 1
         self.index = 0
+        # Token positions right after each SYNC_TOKENS entry, built lazily
+        self.sync_points: list[int] | None = None
 
     @property
-    def scanned(self) -> int:
+    def scanned(self) -> bool:
         """Returns True if tokens has been fully scanned."""
-        if self.index >= len(self.tokens) - 1:
-            return True
-
-        return False
+        return self.index >= self.end
 
     def advance(self) -> None:
         self.index += 1
 
     def get_token(self) -> Token:
-        if self.scanned:
+        if self.index >= self.end:
             return EOF
 
         return self.tokens[self.index]
 
     def get_index(self) -> int:
         if self.index == 0:
-            return self.get_token().index
+            return self.token_indices[0]
 
-        return self.previous().index
+        return self.token_indices[self.index - 1]
 
+    # The last entry in token_types is always TokenType.EOF, which nothing
+    # ever asks for, so these don't need a separate end of file check.
     def peek_next(self, token_type: TokenType) -> bool:
-        token = self.get_token()
-
-        if token is EOF:
-            return False
-
-        return token.token_type == token_type
+        return self.token_types[self.index] is token_type
 
     def match_next(self, *token_types: TokenType) -> bool:
-        token = self.get_token()
-
-        if token is EOF:
-            return False
-
-        if token.token_type in token_types:
-            self.advance()
+        if self.token_types[self.index] in token_types:
+            self.index += 1
             return True
 
         return False
@@ -158,10 +207,21 @@ class Parser:
         Current synchronization process: keep scanning till next statement
         (a.k.a. find a semicolon).
         """
-        while not self.scanned and not self.match_next(
-            TokenType.SEMICOLON, TokenType.RIGHT_BRACE
-        ):
-            self.advance()
+        # Stop right after the closest semicolon or closing brace, or at EOF.
+        # The stopping points are found once, on the first error, so that
+        # each later error is a binary search instead of a scan.
+        if self.sync_points is None:
+            self.sync_points = [
+                index + 1
+                for index, token_type in enumerate(self.token_types)
+                if token_type in SYNC_TOKENS
+            ]
+
+        position = bisect_right(self.sync_points, self.index)
+        if position < len(self.sync_points):
+            self.index = self.sync_points[position]
+        else:
+            self.index = self.end
 
     @overload
     def parse(
@@ -188,7 +248,9 @@ class Parser:
                 if mode == "repl":
                     raise
 
-                errors.append(exc)
+                # Only the message and location are reported, so drop the
+                # traceback instead of keeping every frame of it alive
+                errors.append(exc.with_traceback(None))
                 self.synchronize()
 
         program = Program(body, index=index)
@@ -306,9 +368,12 @@ class Parser:
         return Block(body=statements, index=index)
 
     def parse_block_statements(self) -> list[Stmt]:
+        peek_next = self.peek_next
+        parse_declaration = self.parse_declaration
+
         statements: list[Stmt] = []
-        while not self.scanned and not self.peek_next(TokenType.RIGHT_BRACE):
-            statements.append(self.parse_declaration())
+        while not self.scanned and not peek_next(TokenType.RIGHT_BRACE):
+            statements.append(parse_declaration())
 
         return statements
 
@@ -388,139 +453,105 @@ class Parser:
         return self.parse_assignment()
 
     def parse_assignment(self) -> Expr:
-        expr = self.parse_logical_or()
-        if self.match_next(TokenType.EQUAL):
-            equals_token = self.previous()
-
-            value = self.parse_assignment()
-            if isinstance(expr, Variable):
-                return Assignment(expr.name, value, index=expr.index)
+        # Assignment is right associative. Collect every `target =` in the
+        # chain first, then fold them onto the value from the right, so long
+        # chains don't need one stack frame per `=`.
+        targets: list[tuple[Expr, Token]] = []
+        expr = self.parse_binary()
+        while self.match_next(TokenType.EQUAL):
+            targets.append((expr, self.previous()))
+            expr = self.parse_binary()
+
+        for target, equals_token in reversed(targets):
+            if isinstance(target, Variable):
+                expr = Assignment(target.name, expr, index=target.index)
+
+            elif isinstance(target, Get):
+                expr = Set(target.object, target.name, expr, index=target.index)
 
-            if isinstance(expr, Get):
-                return Set(expr.object, expr.name, value, index=expr.index)
-
-            type_name = expr.__class__.__name__
-            raise ParseError(
-                f"Invalid assign target: {type_name!r}",
-                equals_token,
-            )
+            else:
+                type_name = target.__class__.__name__
+                raise ParseError(
+                    f"Invalid assign target: {type_name!r}",
+                    equals_token,
+                )
 
         # If it's not assignment, it's equality (or anything below)
         return expr
 
-    def parse_logical_or(self) -> Expr:
-        left = self.parse_logical_and()
-        while self.match_next(TokenType.OR):
-            or_token = self.previous()
-            right = self.parse_logical_and()
-
-            left = Binary(left, or_token, right, index=left.index)
-
-        return left
-
-    def parse_logical_and(self) -> Expr:
-        left = self.parse_equality()
-        while self.match_next(TokenType.AND):
-            or_token = self.previous()
-            right = self.parse_equality()
-
-            left = Binary(left, or_token, right, index=left.index)
-
-        return left
-
-    def parse_equality(self) -> Expr:
-        left = self.parse_comparison()
-
-        while self.match_next(TokenType.BANG_EQUAL, TokenType.EQUAL_EQUAL):
-            operator = self.previous()
-            right = self.parse_comparison()
-
-            left = Binary(left, operator, right, index=left.index)
-
-        return left
-
-    def parse_comparison(self) -> Expr:
-        left = self.parse_term()
-
-        while self.match_next(
-            TokenType.GREATER,
-            TokenType.GREATER_EQUAL,
-            TokenType.LESS,
-            TokenType.LESS_EQUAL,
-        ):
-            operator = self.previous()
-            right = self.parse_term()
-
-            left = Binary(left, operator, right, index=left.index)
-
-        return left
-
-    def parse_term(self) -> Expr:
-        left = self.parse_factor()
-
-        while self.match_next(TokenType.PLUS, TokenType.MINUS):
-            operator = self.previous()
-            right = self.parse_factor()
-
-            left = Binary(left, operator, right, index=left.index)
-
-        return left
+    def parse_binary(self, min_level: int = 0) -> Expr:
+        """
+        Parses every rule from logical_or down to factor, by precedence
+        climbing: operators binding at least as tight as `min_level` are
+        folded here, with each right operand parsed one level tighter, which
+        makes every level left associative. An operand only costs one call,
+        instead of one call per precedence level.
+        """
+        tokens = self.tokens
+        token_types = self.token_types
+        precedence = BINARY_PRECEDENCE
 
-    def parse_factor(self) -> Expr:
         left = self.parse_unary()
+        while True:
+            level = precedence.get(token_types[self.index], -1)
+            if level < min_level:
+                return left
 
-        while self.match_next(
-            TokenType.STAR,
-            TokenType.SLASH,
-            TokenType.PERCENT,
-            TokenType.BACKSLASH,
-        ):
-            operator = self.previous()
-            right = self.parse_unary()
+            operator = tokens[self.index]
+            self.index += 1
+            right = self.parse_binary(level + 1)
 
             left = Binary(left, operator, right, index=left.index)
 
-        return left
-
     def parse_unary(self) -> Expr:
-        if self.match_next(TokenType.MINUS, TokenType.BANG):
-            operator = self.previous()
-            right = self.parse_unary()
-            return Unary(operator, right, index=operator.index)
+        operators: list[Token] = []
+        while self.match_next(TokenType.MINUS, TokenType.BANG):
+            operators.append(self.previous())
 
-        return self.parse_power()
+        expr = self.parse_power()
+        for operator in reversed(operators):
+            expr = Unary(operator, expr, index=operator.index)
+
+        return expr
 
     def parse_power(self) -> Expr:
-        left = self.parse_call_or_get()
-        if self.match_next(TokenType.STARSTAR):
-            operator = self.previous()
-            right = self.parse_power()
-            left = Binary(left, operator, right, index=left.index)
+        # `**` is right associative, so fold the operands from the right.
+        operands = [self.parse_call_or_get()]
+        operators: list[Token] = []
+        while self.match_next(TokenType.STARSTAR):
+            operators.append(self.previous())
+            operands.append(self.parse_call_or_get())
+
+        expr = operands.pop()
+        for operator in reversed(operators):
+            left = operands.pop()
+            expr = Binary(left, operator, expr, index=left.index)
 
-        return left
+        return expr
 
     def parse_call_or_get(self) -> Expr:
         expr = self.parse_primary()
 
-        while True:
-            if self.peek_next(TokenType.LEFT_PAREN):
+        token_types = self.token_types
+        while token_types[self.index] in POSTFIX_OPERATORS:
+            if token_types[self.index] is TokenType.LEFT_PAREN:
                 expr = self.parse_call(expr)
-
-            elif self.match_next(TokenType.DOT):
+            else:
+                self.index += 1  # the dot
                 name = self.consume(TokenType.IDENTIFIER, name="property name")
                 expr = Get(expr, name, index=expr.index)
 
-            else:
-                break  # pragma: no cover -- bug with Python parser upto 3.9
-
         return expr
 
     def parse_call(self, callee: Expr) -> Expr:
-        while self.match_next(TokenType.LEFT_PAREN):
+        match_next = self.match_next
+        parse_expression = self.parse_expression
+
+        while match_next(TokenType.LEFT_PAREN):
             bracket = self.previous()
 
             # Case 1: No arguments
-            if self.match_next(TokenType.RIGHT_PAREN):
+            if match_next(TokenType.RIGHT_PAREN):
                 # TODO: maybe we should be using bracket.index here?
                 # the whole call expression does span from callee to
                 # RIGHT_PAREN, but in an error message, pointing at the
@@ -532,13 +563,13 @@ class Parser:
             arguments: list[Expr] = []
 
             # Case 2: One argument
-            arguments.append(self.parse_expression())
-            if self.match_next(TokenType.RIGHT_PAREN):
+            arguments.append(parse_expression())
+            if match_next(TokenType.RIGHT_PAREN):
                 callee = Call(callee, bracket, arguments, index=callee.index)
                 continue
 
             # Case 3: upto 255 arguments, preceded by a comma
-            while self.match_next(TokenType.COMMA):
+            while match_next(TokenType.COMMA):
                 # Only upto 255 arguments allowed
                 if len(arguments) >= 255:
                     raise ParseError(
@@ -546,7 +577,7 @@ class Parser:
                         bracket,
                     )
 
-                arguments.append(self.parse_expression())
+                arguments.append(parse_expression())
 
             self.consume(TokenType.RIGHT_PAREN)
             callee = Call(callee, bracket, arguments, index=callee.index)
@@ -558,9 +589,10 @@ class Parser:
             eof_token = self.get_token()
             raise ParseEOFError("Unexpected end of file while parsing", eof_token)
 
-        if self.match_next(TokenType.STRING, TokenType.INTEGER, TokenType.FLOAT):
-            token = self.previous()
-            return Literal(token.value, index=token.index)
+        index = self.index
+        if self.token_types[index] in LITERAL_TOKENS:
+            self.index += 1
+            return Literal(self.token_values[index], index=self.token_indices[index])
 
         if self.match_next(TokenType.TRUE):
             return Literal(True, index=self.get_index())
@@ -599,15 +631,11 @@ class Parser:
         else:
             expected = repr(expected_type.value)
 
-        token = self.get_token()
-
-        if token == EOF:
-            raise ParseEOFError(
-                f"Expected to find {expected}, found EOF",
-                token,
-            )
+        if self.index >= self.end:
+            raise ParseEOFError(f"Expected to find {expected}, found EOF", EOF)
 
-        if token.token_type != expected_type:
+        token = self.tokens[self.index]
+        if token.token_type is not expected_type:
             raise ParseError(
                 f"Expected to find {expected}, found {token.string!r}",
                 token,
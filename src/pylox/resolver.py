@@ -1,8 +1,7 @@
 from __future__ import annotations
 
-from contextlib import contextmanager
 from enum import Enum, unique
-from typing import Iterator, List, Sequence, TypeVar
+from typing import Sequence
 
 from pylox.interpreter import Interpreter
 from pylox.nodes import (
@@ -11,6 +10,7 @@ from pylox.nodes import (
     ClassDef,
     Expr,
     FunctionDef,
+    Literal,
     Node,
     Program,
     ReturnStmt,
@@ -34,101 +34,122 @@ class ScopeType(Enum):
     SUBCLASS = "subclass"
 
 
-T = TypeVar("T")
-
-
-class Stack(List[T]):
-    def __repr__(self) -> str:  # pragma: no cover -- internal only
-        return f"Stack({super().__repr__()})"
-
-    def __iter__(self) -> Iterator[T]:
-        for i in range(len(self) - 1, -1, -1):
-            yield self[i]
-
-
 class Resolver(Visitor[None]):
     def __init__(self, interpreter: Interpreter) -> None:
         self.interpreter = interpreter
-        self.scope_stack: Stack[set[str]] = Stack()
+        # Innermost scope last
+        self.scope_stack: list[set[str]] = []
         self.current_scope = ScopeType.GLOBAL
         self.function_scope = ScopeType.GLOBAL
         self.class_scope = ScopeType.GLOBAL
+        # Scope depth for each name resolved since the scope stack last
+        # changed, None for globals. Cleared on every change to the stack.
+        self.depth_cache: dict[str, int | None] = {}
 
-    @contextmanager
-    def new_scope(self, scope_type: ScopeType = ScopeType.BLOCK) -> Iterator[None]:
-        old_scope = self.current_scope
+    def push_scope(
+        self, scope_type: ScopeType = ScopeType.BLOCK
+    ) -> tuple[ScopeType, ScopeType, ScopeType]:
+        """Pushes a new scope, and returns the scope types to restore on pop."""
+        old_scopes = (self.current_scope, self.function_scope, self.class_scope)
 
         self.current_scope = scope_type
-        if scope_type == ScopeType.FUNCTION:
+        if scope_type is ScopeType.FUNCTION:
             self.function_scope = scope_type
-        elif scope_type in (ScopeType.CLASS, ScopeType.SUBCLASS):
+        elif scope_type is ScopeType.CLASS or scope_type is ScopeType.SUBCLASS:
             self.class_scope = scope_type
 
         self.scope_stack.append(set())
-        yield
-        self.scope_stack.pop()
+        self.depth_cache.clear()
+        return old_scopes
 
-        self.current_scope = old_scope
-        if scope_type == ScopeType.FUNCTION:
-            self.function_scope = old_scope
-        elif scope_type in (ScopeType.CLASS, ScopeType.SUBCLASS):
-            self.class_scope = old_scope
+    def pop_scope(self, old_scopes: tuple[ScopeType, ScopeType, ScopeType]) -> None:
+        self.scope_stack.pop()
+        self.depth_cache.clear()
+        self.current_scope, self.function_scope, self.class_scope = old_scopes
 
     def peek(self) -> set[str]:
         return self.scope_stack[-1]
 
+    def declare(self, var_name: str) -> None:
+        self.peek().add(var_name)
+        self.depth_cache.clear()
+
     def define(self, name: Token) -> None:
         # Don't define anything for globals
-        if self.current_scope == ScopeType.GLOBAL:
+        if self.current_scope is ScopeType.GLOBAL:
             return
 
         var_name = name.string
-        scope = self.peek()
-        if var_name in scope:
+        if var_name in self.peek():
             raise ParseError(
                 f"Variable {var_name!r} already defined in this scope", name
             )
-        scope.add(var_name)
+        self.declare(var_name)
 
     def visit(self, program: Program) -> None:
-        self.resolve(program.body)
+        self.resolve_list(program.body)
 
-    def resolve(self, item: Node | Sequence[Node]) -> None:
-        if isinstance(item, Sequence):
-            for stmt in item:
-                self.resolve(stmt)
+    def resolve_node(self, node: Node) -> None:
+        node_type = type(node)
+        # Literals have nothing to resolve, and are the most common leaf
+        if node_type is Literal:
+            return
+
+        visitor = self.get_visitor(node)
+        if visitor is not None:
+            visitor(node)
         else:
-            visitor = self.get_visitor(item)
-            if visitor is not None:
-                visitor(item)
-            else:
-                # If there's no special visitor, resolve all children
-                for child in iter_children(item):
-                    self.resolve(child)
+            # If there's no special visitor, resolve all children
+            for child in iter_children(node):
+                self.resolve_node(child)
+
+    def resolve_list(self, nodes: Sequence[Node]) -> None:
+        resolve_node = self.resolve_node
+        for node in nodes:
+            resolve_node(node)
 
     def resolve_local(self, expr: Expr, name: str) -> None:
-        for depth, scope in enumerate(self.scope_stack):
+        try:
+            depth = self.depth_cache[name]
+        except KeyError:
+            depth = self.depth_cache[name] = self.find_depth(name)
+
+        if depth is not None:
+            self.interpreter.resolve(expr, depth)
+
+    def find_depth(self, name: str) -> int | None:
+        for depth, scope in enumerate(reversed(self.scope_stack)):
             if name in scope:
-                self.interpreter.resolve(expr, depth)
-                return
+                return depth
+
+        return None
 
     def visit_Block(self, block: Block) -> None:
-        with self.new_scope():
-            self.resolve(block.body)
+        old_scopes = self.push_scope()
+        try:
+            self.resolve_list(block.body)
+        finally:
+            self.pop_scope(old_scopes)
 
     def visit_VarDeclaration(self, var_decl: VarDeclaration) -> None:
         if var_decl.initializer is not None:
-            self.resolve(var_decl.initializer)
+            self.resolve_node(var_decl.initializer)
 
         self.define(var_decl.name)
 
     def visit_FunctionDef(self, function_def: FunctionDef) -> None:
         self.define(function_def.name)
-        with self.new_scope(ScopeType.FUNCTION):
+        self.resolve_function(function_def)
+
+    def resolve_function(self, function_def: FunctionDef) -> None:
+        old_scopes = self.push_scope(ScopeType.FUNCTION)
+        try:
             for parameter in function_def.parameters:
                 self.define(parameter)
 
-            self.resolve(function_def.body)
+            self.resolve_list(function_def.body)
+        finally:
+            self.pop_scope(old_scopes)
 
     def visit_ClassDef(self, class_def: ClassDef) -> None:
         self.define(class_def.name)
@@ -140,52 +161,52 @@ class Resolver(Visitor[None]):
         ):
             raise ParseError("A class cannot inherit from itself", class_def.name)
 
-        with self.new_scope():
+        super_scopes = self.push_scope()
+        try:
             if class_def.superclass is not None:
-                scope = self.peek()
-                scope.add("super")
+                self.declare("super")
 
             scope_type = ScopeType.SUBCLASS if class_def.superclass else ScopeType.CLASS
-            with self.new_scope(scope_type):
-                scope = self.peek()
-                scope.add("this")
+            this_scopes = self.push_scope(scope_type)
+            try:
+                self.declare("this")
 
                 for method in class_def.methods:
                     self.define(method.name)
-                    with self.new_scope(ScopeType.FUNCTION):
-                        for parameter in method.parameters:
-                            self.define(parameter)
-
-                        self.resolve(method.body)
+                    self.resolve_function(method)
+            finally:
+                self.pop_scope(this_scopes)
+        finally:
+            self.pop_scope(super_scopes)
 
     def visit_Variable(self, variable: Variable) -> None:
         self.resolve_local(variable, name=variable.name.string)
 
     def visit_Assignment(self, assignment: Assignment) -> None:
-        self.resolve(assignment.value)
+        self.resolve_node(assignment.value)
         self.resolve_local(assignment, name=assignment.name.string)
 
     def visit_ReturnStmt(self, return_stmt: ReturnStmt) -> None:
-        if self.function_scope != ScopeType.FUNCTION:
+        if self.function_scope is not ScopeType.FUNCTION:
             raise ParseError("Cannot return outside of a function", return_stmt.keyword)
 
         if return_stmt.value is not None:
-            self.resolve(return_stmt.value)
+            self.resolve_node(return_stmt.value)
 
     def visit_This(self, this: This) -> None:
-        if self.class_scope != ScopeType.CLASS:
+        if self.class_scope is not ScopeType.CLASS:
             raise ParseError("Cannot use 'this' outside of a class", this.keyword)
 
         self.resolve_local(this, this.keyword.string)
 
     def visit_Super(self, super: Super) -> None:
-        if self.class_scope == ScopeType.CLASS:
+        if self.class_scope is ScopeType.CLASS:
             raise ParseError(
                 "Cannot use 'super' in a class with no superclass",
                 super.keyword,
             )
 
-        if self.class_scope != ScopeType.SUBCLASS:
+        if self.class_scope is not ScopeType.SUBCLASS:
             raise ParseError("Cannot use 'super' outside of a class", super.keyword)
 
         self.resolve_local(super, super.keyword.string)
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
 from enum import Enum, unique
 
+from attr import define
+
 from pylox.lox_types import LoxType
 
 
@@ -57,6 +58,12 @@ class TokenType(Enum):
 
     EOF = "EOF"
 
+    # Members are singletons compared by identity, so the C-level identity
+    # hash is enough. `Enum.__hash__` hashes the member name in Python code,
+    # about three times slower than hashing a str, and the parser looks token
+    # types up in dicts and frozensets for nearly every token.
+    __hash__ = object.__hash__
+
 
 KEYWORD_TOKENS = {
     "var": TokenType.VAR,
@@ -77,8 +84,36 @@ KEYWORD_TOKENS = {
     "super": TokenType.SUPER,
 }
 
+# Tokens that are always exactly one character long, and can be looked up
+# directly instead of going through the lexer's if-chain.
+SINGLE_CHAR_TOKENS = {
+    "(": TokenType.LEFT_PAREN,
+    ")": TokenType.RIGHT_PAREN,
+    "{": TokenType.LEFT_BRACE,
+    "}": TokenType.RIGHT_BRACE,
+    ",": TokenType.COMMA,
+    ".": TokenType.DOT,
+    ";": TokenType.SEMICOLON,
+    "+": TokenType.PLUS,
+    "-": TokenType.MINUS,
+    "%": TokenType.PERCENT,
+    "\\": TokenType.BACKSLASH,
+}
+
+# Operators that are one character long, or two when followed by a specific
+# second character. Maps the first character to the second character, and the
+# one and two character token types.
+OPERATOR_TOKENS = {
+    "*": ("*", TokenType.STAR, TokenType.STARSTAR),
+    "=": ("=", TokenType.EQUAL, TokenType.EQUAL_EQUAL),
+    "!": ("=", TokenType.BANG, TokenType.BANG_EQUAL),
+    "<": ("=", TokenType.LESS, TokenType.LESS_EQUAL),
+    ">": ("=", TokenType.GREATER, TokenType.GREATER_EQUAL),
+}
 
-@dataclass(frozen=True)
+# Slotted, as the lexer creates one for every token in the source. Tokens are
+# never weakly referenced, so they skip the `__weakref__` slot as well.
+@define(frozen=True, weakref_slot=False)
 class Token:
     token_type: TokenType
     string: str
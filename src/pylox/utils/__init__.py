@@ -1,12 +1,11 @@
 from __future__ import annotations
 
-from collections import deque
-from typing import TYPE_CHECKING, Generator, Iterable
+from typing import TYPE_CHECKING, Dict, Generator, Tuple, Type
 
 if TYPE_CHECKING:
     from typing_extensions import TypeGuard
 
-from attr import asdict
+from attr import fields
 
 from pylox.lox_types import Boolean, Float, Integer, LoxCallable, LoxType, String
 from pylox.nodes import Node
@@ -39,42 +38,53 @@ def get_snippet_line_col(source: str, index: int) -> tuple[int, int, str]:
     return line, col, snippet
 
 
-def get_lox_type_name(value: LoxType) -> str:
-    from pylox.interpreter import LoxClass, LoxFunction
+# Lox type name of each Python type used for Lox values. The interpreter's
+# classes are added on first use, as importing them here would be circular.
+_lox_type_names: dict[type, str] = {
+    Boolean: "Boolean",
+    String: "String",
+    Integer: "Integer",
+    Float: "Float",
+}
+
 
+def get_lox_type_name(value: LoxType) -> str:
     if value is None:
         return "nil"
 
-    if isinstance(value, bool):
-        return "Boolean"
-
-    if isinstance(value, String):
-        return "String"
+    type_name = _lox_type_names.get(type(value))
+    if type_name is not None:
+        return type_name
 
-    if isinstance(value, Integer):
-        return "Integer"
-
-    if isinstance(value, Float):
-        return "Float"
-
-    if isinstance(value, LoxFunction):
-        return "Function"
+    from pylox.interpreter import LoxClass, LoxFunction
 
-    if isinstance(value, LoxClass):
-        return "Class"
+    _lox_type_names[LoxFunction] = "Function"
+    _lox_type_names[LoxClass] = "Class"
+    type_name = _lox_type_names.get(type(value))
+    if type_name is None:
+        raise NotImplementedError(f"Unknown type for value: {value}")
 
-    raise NotImplementedError(f"Unknown type for value: {value}")
+    return type_name
 
 
 def is_lox_callable(value: LoxType) -> TypeGuard[LoxCallable]:
     return callable(getattr(value, "call", None))
 
 
+# Types of Lox values whose truthiness is the same as in Python. Checked by
+# exact type, which is a single set lookup instead of an isinstance check.
+_truthy_types: frozenset[type] = frozenset({String, Integer, Float})
+
+
 def is_truthy(value: LoxType) -> bool:
-    if value is None:
+    # Conditions are usually booleans, so check for those by identity first
+    if value is True:
+        return True
+
+    if value is False or value is None:
         return False
 
-    if isinstance(value, (String, Integer, Float, Boolean)):
+    if type(value) in _truthy_types:
         return bool(value)
 
     raise NotImplementedError(
@@ -82,21 +92,34 @@ def is_truthy(value: LoxType) -> bool:
     )
 
 
-def attrs_fields(node: Node) -> Generator[Node, None, None]:
-    """Yield attrs fields from an attrs object"""
-    for field_name in asdict(node).keys():
-        yield getattr(node, field_name)
+class ChildFields(Dict[Type[Node], Tuple[str, ...]]):
+    """
+    The names of the fields that can hold child nodes, of each node class:
+    every field except `index`. Each one holds a node, a list or tuple of
+    nodes, or anything else, which is checked on every visit. Worked out the
+    first time each class is looked up.
+    """
+
+    def __missing__(self, node_type: type[Node]) -> tuple[str, ...]:
+        child_fields = self[node_type] = tuple(
+            field.name for field in fields(node_type) if field.name != "index"
+        )
+        return child_fields
+
+
+_child_fields = ChildFields()
 
 
 def iter_children(node: Node) -> Generator[Node, None, None]:
     """
     Yield all direct child nodes of `node`, that is, all fields that are nodes
-    and all items of fields that are lists of nodes.
+    and all items of fields that are lists or tuples of nodes.
     """
-    for field in attrs_fields(node):
+    for field_name in _child_fields[type(node)]:
+        field = getattr(node, field_name)
         if isinstance(field, Node):
             yield field
-        elif isinstance(field, Iterable):
+        elif type(field) is list or type(field) is tuple:
             for item in field:
                 if isinstance(item, Node):
                     yield item
@@ -107,8 +130,20 @@ def walk(node: Node) -> Generator[Node, None, None]:
     Recursively yield all descendant nodes in the tree starting at `node`
     (including `node` itself), in no specified order.
     """
-    nodes = deque([node])
-    while nodes:
-        node = nodes.popleft()
-        nodes.extend(iter_children(node))
+    # Depth first, using a list as the stack. The loop of `iter_children` is
+    # repeated inline, so that no generator is created for every node.
+    child_fields = _child_fields
+    stack = [node]
+    pop = stack.pop
+    append = stack.append
+    while stack:
+        node = pop()
         yield node
+        for field_name in child_fields[type(node)]:
+            field = getattr(node, field_name)
+            if isinstance(field, Node):
+                append(field)
+            elif type(field) is list or type(field) is tuple:
+                for item in field:
+                    if isinstance(item, Node):
+                        append(item)
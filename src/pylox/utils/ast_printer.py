@@ -18,7 +18,7 @@ class AstPrinter(Visitor[str]):
         if literal.value is None:
             return "nil"
 
-        if isinstance(literal.value, bool):
+        if type(literal.value) is bool:
             return f"{literal.value}".lower()
 
         return f"{literal.value!r}"
@@ -31,20 +31,17 @@ class AstPrinter(Visitor[str]):
         return f"({unary.operator.string} {self.visit(unary.right)})"
 
     def visit_Binary(self, binary: Binary) -> str:
-        return (
-            f"({self.visit(binary.left)} "
-            f"{binary.operator.string} "
-            f"{self.visit(binary.right)})"
-        )
+        visit = self.visit
+        return f"({visit(binary.left)} {binary.operator.string} {visit(binary.right)})"
 
     def visit_Grouping(self, grouping: Grouping) -> str:
         return f"(group {self.visit(grouping.expression)})"
 
     def visit_Call(self, call: Call) -> str:
-        return (
-            f"({self.visit(call.callee)} "
-            f"{' '.join(self.visit(arg) for arg in call.arguments)})"
-        )
+        visit = self.visit
+        # A list lets join size the result up front, unlike a generator
+        arguments = " ".join([visit(arg) for arg in call.arguments])
+        return f"({visit(call.callee)} {arguments})"
 
 
 if __name__ == "__main__":
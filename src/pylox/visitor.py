@@ -1,19 +1,42 @@
 from __future__ import annotations
 
-from typing import Callable, Generic, TypeVar, cast
+from typing import Callable, Dict, Generic, Optional, Type, TypeVar
 
 from pylox.nodes import Node
 
 T = TypeVar("T")
 
 
+class VisitorMethods(Dict[Type[Node], Optional[Callable[..., T]]]):
+    """
+    Bound visitor method of `visitor` for each node class, or None if it has
+    none. Each node class is looked up once, the first time it is visited.
+    """
+
+    def __init__(self, visitor: Visitor[T]) -> None:
+        super().__init__()
+        self.visitor = visitor
+
+    def __missing__(self, node_type: type[Node]) -> Callable[..., T] | None:
+        visitor_name = "visit_" + node_type.__name__
+        method = self[node_type] = getattr(self.visitor, visitor_name, None)
+        return method
+
+
 class Visitor(Generic[T]):
     """A pythonic visitor class. Needs no boilerplate."""
 
-    def get_visitor(self, node: Node) -> Callable[..., T]:
-        visitor_name = "visit_" + node.__class__.__name__
-        visitor = cast("Callable[..., T]", getattr(self, visitor_name, None))
-        return visitor
+    visitors: VisitorMethods[T]
+
+    def get_visitor(self, node: Node) -> Callable[..., T] | None:
+        try:
+            visitors = self.visitors
+        except AttributeError:
+            # Subclasses don't have to call `__init__`, so the table is
+            # created on the first visit.
+            visitors = self.visitors = VisitorMethods(self)
+
+        return visitors[type(node)]
 
     def generic_visit(self, node: Node) -> T:
         visitor = self.get_visitor(node)
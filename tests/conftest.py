@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import os.path
+from functools import lru_cache
+from typing import Callable
+
+import pytest
+
+from pylox.interpreter import Interpreter
+from pylox.lexer import Lexer
+from pylox.nodes import Expr, Program
+from pylox.parser import Parser
+from pylox.resolver import Resolver
+from pylox.tokens import Token
+
+TESTDATA_DIR = os.path.join(os.path.dirname(__file__), "testdata")
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config: pytest.Config) -> None:
+    # Benchmarks only run once as regular tests, unless `--benchmark-enable`
+    # is passed. Set here rather than in addopts, as the option only exists
+    # when pytest-benchmark is installed.
+    if config.pluginmanager.hasplugin("benchmark"):
+        config.option.benchmark_disable = True
+
+
+@lru_cache(maxsize=None)
+def _read_testdata(filename: str) -> str:
+    with open(os.path.join(TESTDATA_DIR, filename)) as file:
+        return file.read()
+
+
+@pytest.fixture(scope="session")
+def read_testdata() -> Callable[[str], str]:
+    """Reads a file from testdata. Each file is only read once per session."""
+    return _read_testdata
+
+
+@lru_cache(maxsize=None)
+def _lex(source: str) -> tuple[Token, ...]:
+    return tuple(Lexer(source).tokens)
+
+
+@pytest.fixture(scope="session")
+def lex() -> Callable[[str], list[Token]]:
+    """Lexes source code. Each source is only lexed once per session."""
+
+    def lex(source: str) -> list[Token]:
+        # Tokens are frozen, only the list needs to be a fresh copy
+        return list(_lex(source))
+
+    return lex
+
+
+@lru_cache(maxsize=None)
+def _parse_testdata(filename: str) -> Program:
+    program, errors = Parser(list(_lex(_read_testdata(filename)))).parse()
+    assert not errors
+    return program
+
+
+@pytest.fixture(scope="session")
+def parsed_program() -> Callable[[str], Program]:
+    """Lexes and parses a file from testdata, once per session."""
+    return _parse_testdata
+
+
+@lru_cache(maxsize=None)
+def _resolve_testdata(filename: str) -> tuple[Program, dict[Expr, int]]:
+    program = _parse_testdata(filename)
+
+    interpreter = Interpreter()
+    resolver = Resolver(interpreter)
+    resolver.visit(program)
+    return program, interpreter.locals
+
+
+@pytest.fixture(scope="session")
+def resolved_program() -> Callable[[str], tuple[Program, dict[Expr, int]]]:
+    """
+    Lexes, parses and resolves a file from testdata, once per session.
+    Returns the program, and the resolved locals to seed an Interpreter with.
+    """
+
+    def resolved_program(filename: str) -> tuple[Program, dict[Expr, int]]:
+        # Nodes are frozen, only the locals need to be a fresh copy
+        program, resolved_locals = _resolve_testdata(filename)
+        return program, dict(resolved_locals)
+
+    return resolved_program
@@ -28,8 +28,11 @@ from pylox.utils.ast_printer import AstPrinter
             ),
             "((group (1 - 2)) + (3 * 4))",
         ),
+        (Literal(True), "true"),
+        (Literal(1.0), "1.0"),
     ),
 )
 def test_ast_printer(tree: Expr, output: str) -> None:
     tree_str = AstPrinter().visit(tree)
     assert " ".join(tree_str.split()) == " ".join(output.split())
+
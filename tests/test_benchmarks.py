@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable
+
+import pytest
+
+from pylox.nodes import Program
+from pylox.parser import ParseError, Parser
+from pylox.tokens import Token
+
+# pytest-benchmark is a dev dependency, skip the benchmarks without it
+pytest.importorskip("pytest_benchmark")
+
+if TYPE_CHECKING:
+    from pytest_benchmark.fixture import BenchmarkFixture
+
+
+@pytest.mark.parametrize("filename", ("simple.lox", "functions.lox", "classes.lox"))
+def test_parse_benchmark(
+    filename: str,
+    benchmark: BenchmarkFixture,
+    read_testdata: Callable[[str], str],
+    lex: Callable[[str], list[Token]],
+) -> None:
+    tokens = lex(read_testdata(filename))
+
+    def parse() -> tuple[Program, list[ParseError]]:
+        return Parser(tokens).parse()
+
+    program, errors = benchmark(parse)
+    assert program.body
+    assert not errors
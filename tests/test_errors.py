@@ -3,81 +3,77 @@ from __future__ import annotations
 import io
 import os.path
 import re
+import sys
 from textwrap import dedent
+from typing import Callable, Iterator
 
 import pytest
 from pytest import CaptureFixture, MonkeyPatch
 
 from pylox import main as pylox_main
-from pylox import run_interactive
+from pylox import run, run_interactive
 from pylox.interpreter import Interpreter, InterpreterError
 from pylox.lexer import Lexer, LexError
 from pylox.parser import ParseError, Parser
 from pylox.resolver import Resolver
+from pylox.tokens import Token
 
+TESTDATA_DIR = os.path.join(os.path.dirname(__file__), "testdata")
 
-def test_file_not_found(capsys: CaptureFixture[str]) -> None:
-    """Tests the error message when a wrong path is passed to pylox."""
-    with pytest.raises(SystemExit):
-        pylox_main(argv=["nonexistent_file.py"])
+# The end of the message depends on where exactly the limit is hit
+RECURSION_ERROR = (
+    r"Internal Error:\n"
+    r"RecursionError: maximum recursion depth exceeded.*\n"
+    r"Use the --debug flag to generate a stack trace\."
+)
+RECURSION_ERROR_RE = re.compile(RECURSION_ERROR)
+REPL_RECURSION_ERROR_RE = re.compile(rf"> {RECURSION_ERROR}\n> 10\n>")
 
-    stdout, stderr = capsys.readouterr()
-    assert stderr == ""
-    assert stdout == "Error: given path does not exist\n"
 
-    with pytest.raises(SystemExit):
-        pylox_main(argv=["tests"])
+@pytest.fixture
+def low_recursion_limit() -> Iterator[None]:
+    """Overflows the stack sooner, to keep the crash tests fast."""
+    recursion_limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(200)
+    yield
+    sys.setrecursionlimit(recursion_limit)
 
-    stdout, stderr = capsys.readouterr()
-    assert stderr == ""
-    assert stdout == "Error: given path is a directory\n"
 
+def exact(message: str) -> str:
+    """Returns a pattern for `pytest.raises` that only matches `message` itself."""
+    return f"^{re.escape(message)}$"
 
-@pytest.mark.parametrize(
-    ("source", "error"),
-    ((r'"a\b"', r"Unknown escape sequence: '\b'"),),
-)
-def test_lex_fail(source: str, error: str) -> None:
-    with pytest.raises(LexError) as exc:
-        Lexer(source)
 
-    assert exc.value.message == error
+def format_error(location: str, snippet: str, error: str) -> str:
+    """Builds the expected output for an error at `location`, a file:line:col."""
+    col = int(location.rsplit(":", 1)[1])
+    return f"Error in {location}\n\n    {snippet}\n    {' ' * col}^\n{error}\n"
 
 
 @pytest.mark.parametrize(
-    ("filename", "error"),
+    ("path", "error"),
     (
-        (
-            "fail1.lox",
-            """\
-            Error in fail1.lox:3:20
-
-                And it has \\na few \\escapes.
-                                    ^
-            LexError: Unknown escape sequence: '\\e'
-            """,
-        ),
-        (
-            "fail2.lox",
-            """\
-            Error in fail2.lox:1:6
-
-                print "Hello!
-                      ^
-            LexIncompleteError: Unterminated string
-            """,
-        ),
+        ("nonexistent_file.py", "Error: given path does not exist\n"),
+        (TESTDATA_DIR, "Error: given path is a directory\n"),
     ),
 )
-def test_lex_fail_files(filename: str, error: str, capsys: CaptureFixture[str]) -> None:
+def test_file_not_found(path: str, error: str, capsys: CaptureFixture[str]) -> None:
+    """Tests the error message when a wrong path is passed to pylox."""
     with pytest.raises(SystemExit):
-        test_dir = os.path.join(os.path.dirname(__file__), "testdata")
-        filepath = os.path.join(test_dir, filename)
-        pylox_main(argv=[filepath])
+        pylox_main(argv=[path])
 
     stdout, stderr = capsys.readouterr()
     assert stderr == ""
-    assert stdout.rstrip() == dedent(error).rstrip()
+    assert stdout == error
+
+
+@pytest.mark.parametrize(
+    ("source", "error"),
+    ((r'"a\b"', r"Unknown escape sequence: '\b'"),),
+)
+def test_lex_fail(source: str, error: str) -> None:
+    with pytest.raises(LexError, match=exact(error)):
+        Lexer(source)
 
 
 @pytest.mark.parametrize(
@@ -88,14 +84,12 @@ def test_lex_fail_files(filename: str, error: str, capsys: CaptureFixture[str])
         ("class 5 {}", "Expected to find class name, found '5'"),
     ),
 )
-def test_parse_fail(source: str, error: str) -> None:
-    tokens = Lexer(source).tokens
+def test_parse_fail(source: str, error: str, lex: Callable[[str], list[Token]]) -> None:
+    tokens = lex(source)
 
-    with pytest.raises(ParseError) as exc:
+    with pytest.raises(ParseError, match=exact(error)):
         Parser(tokens).parse(mode="repl")
 
-    assert exc.value.message == error
-
 
 @pytest.mark.parametrize(
     ("source", "error"),
@@ -110,9 +104,13 @@ def test_parse_fail(source: str, error: str) -> None:
         ),
     ),
 )
-def test_resolver_fail(source: str, error: str) -> None:
-    with pytest.raises(ParseError) as exc:
-        tokens = Lexer(source).tokens
+def test_resolver_fail(
+    source: str,
+    error: str,
+    lex: Callable[[str], list[Token]],
+) -> None:
+    with pytest.raises(ParseError, match=exact(error)):
+        tokens = lex(source)
         parser = Parser(tokens)
         tree, errors = parser.parse()
         assert not errors
@@ -120,72 +118,6 @@ def test_resolver_fail(source: str, error: str) -> None:
         resolver = Resolver(interpreter)
         resolver.visit(tree)
 
-    assert exc.value.message == error
-
-
-@pytest.mark.parametrize(
-    ("filename", "error"),
-    (
-        (
-            "fail3.lox",
-            """\
-            Error in fail3.lox:2:2
-
-                i++;
-                  ^
-            ParseError: Unexpected token: '+'
-            """,
-        ),
-        (
-            "fail7.lox",
-            """\
-            Error in fail7.lox:3:6
-
-                  var x = "y";
-                      ^
-            ParseError: Variable 'x' already defined in this scope
-            """,
-        ),
-        (
-            "fail8.lox",
-            """\
-            Error in fail8.lox:1:5
-
-                fun f(
-                     ^
-            ParseError: More than 255 parameters not allowed in a function definition
-
-            Error in fail8.lox:14:4
-
-                f() = 10;
-                    ^
-            ParseError: Invalid assign target: 'Call'
-
-            Error in fail8.lox:16:9
-
-                value = f(
-                         ^
-            ParseError: More than 255 arguments not allowed in a function call
-            
-            Found 3 errors.
-            """,
-        ),
-    ),
-)
-def test_parse_fail_files(
-    filename: str,
-    error: str,
-    capsys: CaptureFixture[str],
-) -> None:
-    with pytest.raises(SystemExit):
-        test_dir = os.path.join(os.path.dirname(__file__), "testdata")
-        filepath = os.path.join(test_dir, filename)
-        pylox_main(argv=[filepath])
-
-    stdout, stderr = capsys.readouterr()
-    assert stderr == ""
-    assert stdout.rstrip() == dedent(error).rstrip()
-
 
 @pytest.mark.parametrize(
     ("source", "error"),
@@ -207,9 +139,13 @@ def test_parse_fail_files(
         ("dir(5.5);", "dir() can only be used on classes and objects, not 'Float'"),
     ),
 )
-def test_interpreter_fail(source: str, error: str) -> None:
-    with pytest.raises(InterpreterError) as exc:
-        tokens = Lexer(source).tokens
+def test_interpreter_fail(
+    source: str,
+    error: str,
+    lex: Callable[[str], list[Token]],
+) -> None:
+    with pytest.raises(InterpreterError, match=exact(error)):
+        tokens = lex(source)
         parser = Parser(tokens)
         tree, errors = parser.parse()
         assert not errors
@@ -218,50 +154,106 @@ def test_interpreter_fail(source: str, error: str) -> None:
         resolver.visit(tree)
         interpreter.visit(tree)
 
-    assert exc.value.message == error
-
 
 @pytest.mark.parametrize(
     ("filename", "error"),
     (
-        (
-            "fail4.lox",
-            """\
-            Error in fail4.lox:2:0
+        pytest.param(
+            "fail1.lox",
+            format_error(
+                "fail1.lox:3:20",
+                "And it has \\na few \\escapes.",
+                "LexError: Unknown escape sequence: '\\e'",
+            ),
+            id="fail1-lex",
+        ),
+        pytest.param(
+            "fail2.lox",
+            format_error(
+                "fail2.lox:1:6",
+                'print "Hello!',
+                "LexIncompleteError: Unterminated string",
+            ),
+            id="fail2-lex",
+        ),
+        pytest.param(
+            "fail3.lox",
+            format_error(
+                "fail3.lox:2:2",
+                "i++;",
+                "ParseError: Unexpected token: '+'",
+            ),
+            id="fail3-parse",
+        ),
+        pytest.param(
+            "fail7.lox",
+            format_error(
+                "fail7.lox:3:6",
+                '  var x = "y";',
+                "ParseError: Variable 'x' already defined in this scope",
+            ),
+            id="fail7-parse",
+        ),
+        pytest.param(
+            "fail8.lox",
+            dedent(
+                """\
+                Error in fail8.lox:1:5
 
-                y = x + 1;
-                ^
-            InterpreterError: Assigning to variable 'y' before declaration
-            """,
+                    fun f(
+                         ^
+                ParseError: More than 255 parameters not allowed in a function definition
+
+                Error in fail8.lox:14:4
+
+                    f() = 10;
+                        ^
+                ParseError: Invalid assign target: 'Call'
+
+                Error in fail8.lox:16:9
+
+                    value = f(
+                             ^
+                ParseError: More than 255 arguments not allowed in a function call
+            
+                Found 3 errors.
+                """
+            ),
+            id="fail8-parse",
         ),
-        (
+        pytest.param(
+            "fail4.lox",
+            format_error(
+                "fail4.lox:2:0",
+                "y = x + 1;",
+                "InterpreterError: Assigning to variable 'y' before declaration",
+            ),
+            id="fail4-interpret",
+        ),
+        pytest.param(
             "fail5.lox",
-            """\
-            Error in fail5.lox:2:2
-
-                  x = "This variable doesn't exist";
-                  ^
-            InterpreterError: Assigning to variable 'x' before declaration
-            """,
+            format_error(
+                "fail5.lox:2:2",
+                "  x = \"This variable doesn't exist\";",
+                "InterpreterError: Assigning to variable 'x' before declaration",
+            ),
+            id="fail5-interpret",
         ),
     ),
 )
-def test_interpret_fail_files(
-    filename: str,
-    error: str,
-    capsys: CaptureFixture[str],
-) -> None:
-    with pytest.raises(SystemExit):
-        test_dir = os.path.join(os.path.dirname(__file__), "testdata")
-        filepath = os.path.join(test_dir, filename)
-        pylox_main(argv=[filepath])
+def test_fail_files(filename: str, error: str, capsys: CaptureFixture[str]) -> None:
+    # Runs the file directly, as `test_run` already covers going through main()
+    assert run(os.path.join(TESTDATA_DIR, filename)) == 1
 
     stdout, stderr = capsys.readouterr()
     assert stderr == ""
-    assert stdout.rstrip() == dedent(error).rstrip()
+    assert stdout.rstrip() == error.rstrip()
 
 
-def test_run(capsys: CaptureFixture[str], monkeypatch: MonkeyPatch) -> None:
+def test_run_bad_arguments(
+    capsys: CaptureFixture[str],
+    monkeypatch: MonkeyPatch,
+) -> None:
     monkeypatch.setattr("sys.argv", ["lox", "a.lox", "b.lox"])
 
     with pytest.raises(SystemExit):
@@ -274,6 +266,8 @@ def test_run(capsys: CaptureFixture[str], monkeypatch: MonkeyPatch) -> None:
     )
     assert stdout == ""
 
+
+def test_run_repl(capsys: CaptureFixture[str], monkeypatch: MonkeyPatch) -> None:
     monkeypatch.setattr("sys.argv", ["lox"])
     monkeypatch.setattr("sys.stdin", io.StringIO("var x = 5;\nprint x;\nprint y;"))
 
@@ -295,45 +289,55 @@ def test_run(capsys: CaptureFixture[str], monkeypatch: MonkeyPatch) -> None:
     )
     assert stdout.strip() == expected.strip()
 
-    monkeypatch.setattr("sys.argv", ["lox", "tests/testdata/operators.lox"])
+
+def test_run_file(monkeypatch: MonkeyPatch) -> None:
+    operators_path = os.path.join(TESTDATA_DIR, "operators.lox")
+    monkeypatch.setattr("sys.argv", ["lox", operators_path])
     with pytest.raises(SystemExit) as exc:
         pylox_main()
 
-    capsys.readouterr()  # to flush the output
     assert exc.value.code == 0
 
-    monkeypatch.setattr("sys.argv", ["lox", "tests/testdata/fail9.lox"])
-    with pytest.raises(SystemExit) as exc:
+
+@pytest.mark.slow
+@pytest.mark.usefixtures("low_recursion_limit")
+def test_run_crash(capsys: CaptureFixture[str], monkeypatch: MonkeyPatch) -> None:
+    fail9_path = os.path.join(TESTDATA_DIR, "fail9.lox")
+    monkeypatch.setattr("sys.argv", ["lox", fail9_path])
+    with pytest.raises(SystemExit):
         pylox_main()
 
     stdout, stderr = capsys.readouterr()
     assert stderr == ""
-    expected = dedent(
-        """\
-        Internal Error:
-        RecursionError: maximum recursion depth exceeded(.*)
-        Use the --debug flag to generate a stack trace.
-        """
-    )
-    assert re.fullmatch(expected.strip(), stdout.strip()) is not None
+    assert RECURSION_ERROR_RE.fullmatch(stdout.strip()) is not None
 
-    monkeypatch.setattr("sys.argv", ["lox", "tests/testdata/fail9.lox", "--debug"])
-    with pytest.raises(SystemExit) as exc:
+
+@pytest.mark.slow
+@pytest.mark.usefixtures("low_recursion_limit")
+def test_run_crash_debug(
+    capsys: CaptureFixture[str],
+    monkeypatch: MonkeyPatch,
+) -> None:
+    fail9_path = os.path.join(TESTDATA_DIR, "fail9.lox")
+    monkeypatch.setattr("sys.argv", ["lox", fail9_path, "--debug"])
+    with pytest.raises(SystemExit):
         pylox_main()
 
     stdout, stderr = capsys.readouterr()
     assert stdout == ""
 
-    output = stderr.splitlines()
-    assert len(output) > 1000
-    assert output[-1].startswith("RecursionError: maximum recursion depth exceeded")
+    # Only the line count and the last line are needed from the long traceback
+    assert stderr.count("\n") > 100
+    last_line = stderr.rstrip("\n").rpartition("\n")[2]
+    assert last_line.startswith("RecursionError: maximum recursion depth exceeded")
 
 
 def test_interactive_flag(
     capsys: CaptureFixture[str],
     monkeypatch: MonkeyPatch,
 ) -> None:
-    monkeypatch.setattr("sys.argv", ["lox", "-i", "tests/testdata/simple.lox"])
+    simple_path = os.path.join(TESTDATA_DIR, "simple.lox")
+    monkeypatch.setattr("sys.argv", ["lox", "-i", simple_path])
     monkeypatch.setattr("sys.stdin", io.StringIO("print !a;"))
 
     with pytest.raises(SystemExit):
@@ -435,6 +439,8 @@ def test_run_interactive(capsys: CaptureFixture[str], monkeypatch: MonkeyPatch)
     assert stdout.rstrip() == dedent(expected).rstrip()
 
 
+@pytest.mark.slow
+@pytest.mark.usefixtures("low_recursion_limit")
 def test_crash_handling(capsys: CaptureFixture[str], monkeypatch: MonkeyPatch) -> None:
     monkeypatch.setattr("sys.stdin", io.StringIO("fun f() { f(); } f();\nprint 10;"))
     run_interactive()
@@ -442,11 +448,4 @@ def test_crash_handling(capsys: CaptureFixture[str], monkeypatch: MonkeyPatch) -
     stdout, stderr = capsys.readouterr()
     assert stderr == ""
 
-    expected = """\
-        > Internal Error:
-        RecursionError: maximum recursion depth exceeded while calling a Python object
-        Use the --debug flag to generate a stack trace.
-        > 10
-        >
-    """
-    assert stdout.rstrip() == dedent(expected).rstrip()
+    assert REPL_RECURSION_ERROR_RE.fullmatch(stdout.rstrip()) is not None
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
-import os.path
 from textwrap import dedent
+from typing import Callable
 
 import pytest
 from pytest import CaptureFixture, MonkeyPatch
@@ -30,7 +30,7 @@ from pylox.tokens import Token, TokenType
 @pytest.mark.parametrize(
     ("tree", "expected"),
     (
-        (
+        pytest.param(
             Binary(
                 left=Literal(value=2),
                 operator=Token(token_type=TokenType.PLUS, string="+", value=None),
@@ -41,10 +41,21 @@ from pylox.tokens import Token, TokenType
                 ),
             ),
             17,
+            id="2+3*5",
+        ),
+        pytest.param(
+            Binary(
+                left=Literal(value=2.0),
+                operator=Token(token_type=TokenType.PLUS, string="+", value=None),
+                right=Literal(value=3.0),
+            ),
+            5.0,
+            id="floats",
         ),
     ),
 )
 def test_interpreter_expr(tree: Expr, expected: LoxType) -> None:
+    # These trees have no variables, so they don't need resolving
     output = Interpreter().evaluate(tree)
     assert output == expected
 
@@ -52,7 +63,7 @@ def test_interpreter_expr(tree: Expr, expected: LoxType) -> None:
 @pytest.mark.parametrize(
     ("tree", "output"),
     (
-        (
+        pytest.param(
             Program(
                 body=[
                     VarDeclaration(
@@ -63,8 +74,9 @@ def test_interpreter_expr(tree: Expr, expected: LoxType) -> None:
                 ]
             ),
             "hello lox!",
+            id="var",
         ),
-        (
+        pytest.param(
             Program(
                 body=[
                     VarDeclaration(
@@ -93,8 +105,9 @@ def test_interpreter_expr(tree: Expr, expected: LoxType) -> None:
                 ],
             ),
             "5\n5",
+            id="assignment",
         ),
-        (
+        pytest.param(
             Program(
                 body=[
                     VarDeclaration(
@@ -159,8 +172,9 @@ def test_interpreter_expr(tree: Expr, expected: LoxType) -> None:
                 ]
             ),
             "la\neb\ngc\nea\neb\ngc\nga\ngb\ngc",
+            id="block_scoping",
         ),
-        (
+        pytest.param(
             Program(
                 body=[
                     Print(
@@ -191,6 +205,7 @@ def test_interpreter_expr(tree: Expr, expected: LoxType) -> None:
                 ]
             ),
             "7",
+            id="logical",
         ),
     ),
 )
@@ -214,115 +229,144 @@ def test_interpreter(
 @pytest.mark.parametrize(
     ("filename", "output"),
     (
-        (
+        pytest.param(
             "simple.lox",
-            """\
-            Hello
-            5
-            false
-            27.0
-            """,
+            dedent(
+                """\
+                Hello
+                5
+                false
+                27.0
+                """
+            ).rstrip(),
+            id="simple",
         ),
-        (
+        pytest.param(
             "operators.lox",
-            """\
-            true
-            false
-            false
-            -3
-            0
-            true
-            false
-            0.25
-            0.5
-            abcdef
-            8
-            522
-            """,
+            dedent(
+                """\
+                true
+                false
+                false
+                -3
+                0
+                true
+                false
+                0.25
+                0.5
+                abcdef
+                8
+                522
+                """
+            ).rstrip(),
+            id="operators",
         ),
-        (
+        pytest.param(
             "control_flow.lox",
-            """\
-            Number is positive
-            Number is small
-            Should run
-            2
-            4
-            8
-            0
-            1
-            2
-            10
-            20
-            """,
+            dedent(
+                """\
+                Number is positive
+                Number is small
+                Should run
+                2
+                4
+                8
+                0
+                1
+                2
+                10
+                20
+                """
+            ).rstrip(),
+            id="control_flow",
         ),
-        (
+        pytest.param(
             "native_functions.lox",
-            """\
-            <native function 'clock'>
-            true
-            true
-            <native function 'dir'>
-            ['bar', 'foo']
-            ['bar', 'baz', 'bruh', 'foo']
-            """,
+            dedent(
+                """\
+                <native function 'clock'>
+                true
+                true
+                <native function 'dir'>
+                ['bar', 'foo']
+                ['bar', 'baz', 'bruh', 'foo']
+                """
+            ).rstrip(),
+            id="native_functions",
         ),
-        (
+        pytest.param(
             "functions.lox",
-            """\
-            <function 'hello'>
-            Hello
-            Hello
-            1
-            2
-            3
-            30
-            70
-            Counter starting
-            1
-            2
-            360
-            nil
-            1
-            """,
+            dedent(
+                """\
+                <function 'hello'>
+                Hello
+                Hello
+                1
+                2
+                3
+                30
+                70
+                Counter starting
+                1
+                2
+                360
+                nil
+                1
+                42
+                returned
+                """
+            ).rstrip(),
+            id="functions",
         ),
-        (
+        pytest.param(
             "static_resolution.lox",
-            """\
-            global
-            global
-            global
-            """,
+            dedent(
+                """\
+                global
+                global
+                global
+                """
+            ).rstrip(),
+            id="static_resolution",
         ),
-        (
+        pytest.param(
             "classes.lox",
-            """\
-            <class 'C'>
-            10
-            The German chocolatecake is delicious
-            foo
-            bob
-            alice
-            """,
+            dedent(
+                """\
+                <class 'C'>
+                10
+                The German chocolatecake is delicious
+                foo
+                bob
+                alice
+                """
+            ).rstrip(),
+            id="classes",
         ),
-        (
+        pytest.param(
             "inheritance.lox",
-            """\
-            Fry until golden brown
-            C
-            D
-            A
-            """,
+            dedent(
+                """\
+                Fry until golden brown
+                C
+                D
+                A
+                """
+            ).rstrip(),
+            id="inheritance",
         ),
-        (
+        pytest.param(
             "escapes.lox",
-            """\
-            a
-            \tb
-            a\\b\\c\\d
-            'hello'
-            "This is lox's lexer"
-            """,
+            dedent(
+                """\
+                a
+                \tb
+                a\\b\\c\\d
+                'hello'
+                "This is lox's lexer"
+                """
+            ).rstrip(),
+            id="escapes",
         ),
     ),
 )
@@ -330,26 +374,16 @@ def test_interpreter_files(
     filename: str,
     output: str,
     capsys: CaptureFixture[str],
+    resolved_program: Callable[[str], tuple[Program, dict[Expr, int]]],
 ) -> None:
-    test_dir = os.path.join(os.path.dirname(__file__), "testdata")
-    filepath = os.path.join(test_dir, filename)
-    with open(filepath) as file:
-        source = file.read()
-
-    tokens = Lexer(source).tokens
-    parser = Parser(tokens)
-    program, errors = parser.parse()
-    assert not errors
+    program, resolved_locals = resolved_program(filename)
 
     interpreter = Interpreter()
-
-    resolver = Resolver(interpreter)
-    resolver.visit(program)
-
+    interpreter.locals.update(resolved_locals)
     interpreter.visit(program)
 
     stdout, stderr = capsys.readouterr()
-    assert stdout.rstrip() == dedent(output).rstrip()
+    assert stdout.rstrip() == output
     assert stderr == ""
 
 
@@ -1,18 +1,13 @@
 from __future__ import annotations
 
-import os.path
+from typing import Callable
 
 import pytest
 
-from pylox.lexer import Lexer, LexError
+from pylox.lexer import CHAR_SCANNERS, Lexer, LexError
 from pylox.tokens import EOF, Token, TokenType
 
 
-def read_file(filepath: str) -> str:
-    with open(filepath) as file:
-        return file.read()
-
-
 @pytest.mark.parametrize(
     ("code", "tokens"),
     (
@@ -20,6 +15,7 @@ def read_file(filepath: str) -> str:
         ("abc", [Token(TokenType.IDENTIFIER, "abc", index=0), EOF]),
         ("nil", [Token(TokenType.NIL, "nil", index=0), EOF]),
         ("12", [Token(TokenType.INTEGER, "12", 12, index=0), EOF]),
+        ("0.3", [Token(TokenType.FLOAT, "0.3", 0.3, index=0), EOF]),
         (
             "2.",
             [
@@ -65,6 +61,10 @@ def read_file(filepath: str) -> str:
                 EOF,
             ],
         ),
+        ("\u0663", [Token(TokenType.INTEGER, "\u0663", 3, index=0), EOF]),
+        ("\u00e91", [Token(TokenType.IDENTIFIER, "\u00e91", index=0), EOF]),
+        ("x // \0", [Token(TokenType.IDENTIFIER, "x", index=0), EOF]),
+        ('"a\0"', [Token(TokenType.STRING, '"a\0"', "a\0", index=0), EOF]),
     ),
 )
 def test_lex(code: str, tokens: list[Token]) -> None:
@@ -72,6 +72,24 @@ def test_lex(code: str, tokens: list[Token]) -> None:
     assert output == tokens
 
 
+def test_char_scanners() -> None:
+    """The ASCII scanner table agrees with str's own character classes."""
+    for code in range(128):
+        char = chr(code)
+        scanner = CHAR_SCANNERS.get(char)
+        assert (scanner is Lexer.scan_number) == char.isdigit()
+        assert (scanner is Lexer.scan_identifier) == (char.isalpha() or char == "_")
+
+
+def test_lex_interns_identifiers() -> None:
+    """Names are interned, so scope lookups can compare them by identity."""
+    tokens = Lexer("var long_name = 1; print long_name;").tokens
+    first, second = (
+        token.string for token in tokens if token.token_type == TokenType.IDENTIFIER
+    )
+    assert first is second
+
+
 @pytest.mark.parametrize(
     ("filename", "tokens"),
     (
@@ -157,11 +175,12 @@ def test_lex(code: str, tokens: list[Token]) -> None:
         ),
     ),
 )
-def test_lex_files(filename: str, tokens: list[Token]) -> None:
-    test_dir = os.path.join(os.path.dirname(__file__), "testdata")
-    filepath = os.path.join(test_dir, filename)
-    source = read_file(filepath)
-
+def test_lex_files(
+    filename: str,
+    tokens: list[Token],
+    read_testdata: Callable[[str], str],
+) -> None:
+    source = read_testdata(filename)
     output = Lexer(source).tokens
     assert output == tokens
 
@@ -171,6 +190,8 @@ def test_lex_files(filename: str, tokens: list[Token]) -> None:
     (
         ("#", "Unknown character found: '#'"),
         ('string = "abc', "Unterminated string"),
+        ('"abc\\', "Unterminated string"),
+        ("x\0", "Unknown character found: '\0'"),
     ),
 )
 def test_lex_fail(code: str, error_msg: str) -> None:
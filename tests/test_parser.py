@@ -1,15 +1,22 @@
 from __future__ import annotations
 
-import os
+import inspect
+import os.path
+import sys
+from bisect import bisect_right
+from typing import Callable
 
 import pytest
+from pytest import MonkeyPatch
 
+import pylox.parser
 from pylox.lexer import Lexer
 from pylox.nodes import (
     Assignment,
     Binary,
     Block,
     Call,
+    Expr,
     ExprStmt,
     Get,
     Grouping,
@@ -17,6 +24,8 @@ from pylox.nodes import (
     Print,
     Program,
     Set,
+    Stmt,
+    Unary,
     VarDeclaration,
     Variable,
 )
@@ -24,10 +33,7 @@ from pylox.parser import Parser
 from pylox.tokens import EOF, Token, TokenType
 from pylox.utils.ast_printer import AstPrinter
 
-
-def read_file(filepath: str) -> str:
-    with open(filepath) as file:
-        return file.read()
+TESTDATA_DIR = os.path.join(os.path.dirname(__file__), "testdata")
 
 
 def test_parser_no_eof() -> None:
@@ -46,18 +52,27 @@ def test_parser_no_eof() -> None:
 @pytest.mark.parametrize(
     ("tokens", "expected_tree"),
     (
-        ([Token(TokenType.IDENTIFIER, "abc"), EOF], "abc"),
-        ([Token(TokenType.NIL, "nil"), EOF], "nil"),
-        (
+        pytest.param(
+            [Token(TokenType.IDENTIFIER, "abc"), EOF],
+            Variable(Token(TokenType.IDENTIFIER, "abc")),
+            id="variable",
+        ),
+        pytest.param([Token(TokenType.NIL, "nil"), EOF], "nil", id="nil"),
+        pytest.param(
             [
                 Token(TokenType.IDENTIFIER, "a"),
                 Token(TokenType.PLUS, "+"),
                 Token(TokenType.INTEGER, "1", 1),
                 EOF,
             ],
-            "(a + 1)",
+            Binary(
+                left=Variable(Token(TokenType.IDENTIFIER, "a")),
+                operator=Token(TokenType.PLUS, "+"),
+                right=Literal(1),
+            ),
+            id="addition",
         ),
-        (
+        pytest.param(
             [
                 Token(TokenType.STRING, '"abc"', "abc"),
                 Token(TokenType.PLUS, "+"),
@@ -67,8 +82,9 @@ def test_parser_no_eof() -> None:
                 EOF,
             ],
             "(('abc' + 'xyz') + rest)",
+            id="concatenation",
         ),
-        (
+        pytest.param(
             [
                 Token(TokenType.LEFT_PAREN, "("),
                 Token(TokenType.IDENTIFIER, "x"),
@@ -82,8 +98,9 @@ def test_parser_no_eof() -> None:
                 EOF,
             ],
             "((group (x / y)) + (2 * z))",
+            id="grouping",
         ),
-        (
+        pytest.param(
             [
                 Token(TokenType.IDENTIFIER, "a"),
                 Token(TokenType.EQUAL_EQUAL, "=="),
@@ -95,8 +112,9 @@ def test_parser_no_eof() -> None:
                 EOF,
             ],
             "(((a == b) == c) == 5)",
+            id="equality_chain",
         ),
-        (
+        pytest.param(
             [
                 Token(TokenType.IDENTIFIER, "x"),
                 Token(TokenType.EQUAL_EQUAL, "=="),
@@ -130,8 +148,9 @@ def test_parser_no_eof() -> None:
                     !=
                     (group ((1 + 3) > 5)))))
             """,
+            id="nested_equality",
         ),
-        (
+        pytest.param(
             [
                 Token(TokenType.IDENTIFIER, "a"),
                 Token(TokenType.AND, "and"),
@@ -150,8 +169,9 @@ def test_parser_no_eof() -> None:
                 EOF,
             ],
             "(((a and b) or ((true and false) and (! x))) or (y and z))",
+            id="logical",
         ),
-        (
+        pytest.param(
             [
                 Token(TokenType.IDENTIFIER, "fibonacci"),
                 Token(TokenType.LEFT_PAREN, "("),
@@ -170,8 +190,9 @@ def test_parser_no_eof() -> None:
                 EOF,
             ],
             "((fibonacci 5) == ((fibonacci 4) + (fibonacci 3)))",
+            id="calls",
         ),
-        (
+        pytest.param(
             [
                 Token(TokenType.IDENTIFIER, "a"),
                 Token(TokenType.LEFT_PAREN, "("),
@@ -186,49 +207,120 @@ def test_parser_no_eof() -> None:
                 EOF,
             ],
             "(((a 10) 20) 30)",
+            id="call_chain",
         ),
     ),
 )
-def test_parser_exprs(tokens: list[Token], expected_tree: str) -> None:
+def test_parser_exprs(tokens: list[Token], expected_tree: Expr | str) -> None:
     parser = Parser(tokens)
     expression = parser.parse_expression()
-    tree_str = AstPrinter().visit(expression)
-    assert " ".join(tree_str.split()) == " ".join(expected_tree.split())
+    # Small trees are compared directly, bigger ones are easier to read printed
+    if isinstance(expected_tree, Expr):
+        assert expression == expected_tree
+        return
+
+    # The printer always separates with single spaces, only the expected
+    # trees need their whitespace normalized
+    assert AstPrinter().visit(expression) == " ".join(expected_tree.split())
+
+
+@pytest.mark.parametrize(
+    ("source", "expected_tree"),
+    (
+        ("2 ** 3 ** 4", "(2 ** (3 ** 4))"),
+        ("!-!x", "(! (- (! x)))"),
+        ("-a ** b", "(- (a ** b))"),
+    ),
+)
+def test_parser_right_associative(source: str, expected_tree: str) -> None:
+    expression = Parser(Lexer(source).tokens).parse_expression()
+    assert AstPrinter().visit(expression) == expected_tree
+
+
+# These tests patch the parser module, which only works when the parser is
+# the interpreted module. A mypyc-compiled parser can't be patched.
+interpreted_parser_only = pytest.mark.skipif(
+    not inspect.isfunction(vars(Parser)["parse_declaration"]),
+    reason="the parser is compiled",
+)
+
+
+@interpreted_parser_only
+def test_parser_many_errors(monkeypatch: MonkeyPatch) -> None:
+    """Recovering from each error doesn't rescan the rest of the file."""
+    searched: list[list[int]] = []
+
+    def counting_bisect_right(points: list[int], index: int) -> int:
+        searched.append(points)
+        return bisect_right(points, index)
+
+    monkeypatch.setattr(pylox.parser, "bisect_right", counting_bisect_right)
+
+    count = 2000
+    _, errors = Parser(Lexer("+ }\n" * count).tokens).parse()
+    assert len(errors) == count
+    # The stopping points are collected in a single pass over the tokens, and
+    # every error is then one binary search into that same list.
+    assert len(searched) == count
+    assert all(points is searched[0] for points in searched)
+    assert len(searched[0]) == count
+
+
+def test_parser_long_chains() -> None:
+    """Right associative chains are parsed without recursing per operator."""
+    depth = sys.getrecursionlimit() * 2
+
+    expression = Parser(Lexer("!" * depth + "x").tokens).parse_expression()
+    for _ in range(depth):
+        assert isinstance(expression, Unary)
+        expression = expression.right
+    assert isinstance(expression, Variable)
+
+    source = "a = " * depth + "1"
+    expression = Parser(Lexer(source).tokens).parse_expression()
+    for _ in range(depth):
+        assert isinstance(expression, Assignment)
+        expression = expression.value
+    assert isinstance(expression, Literal)
 
 
 @pytest.mark.parametrize(
     ("filename", "expected_tree"),
     (
-        (
+        pytest.param(
             "expression.lox",
             "(2 + (3 * 5))",
+            id="expression",
         ),
-        (
+        pytest.param(
             "expression_long.lox",
             """
             ((group
                 ((((2 > 3) > (4 + 5)) != x) == ((y * z) / w)))
                 == (false + true))
             """,
+            id="expression_long",
         ),
     ),
 )
-def test_parser_expr_files(filename: str, expected_tree: str) -> None:
-    test_dir = os.path.join(os.path.dirname(__file__), "testdata")
-    filepath = os.path.join(test_dir, filename)
-    source = read_file(filepath)
-
-    tokens = Lexer(source).tokens
+def test_parser_expr_files(
+    filename: str,
+    expected_tree: str,
+    read_testdata: Callable[[str], str],
+    lex: Callable[[str], list[Token]],
+) -> None:
+    tokens = lex(read_testdata(filename))
     parser = Parser(tokens)
     expression = parser.parse_expression()
-    tree_str = AstPrinter().visit(expression)
-    assert " ".join(tree_str.split()) == " ".join(expected_tree.split())
+    # The printer always separates with single spaces, only the expected
+    # trees need their whitespace normalized
+    assert AstPrinter().visit(expression) == " ".join(expected_tree.split())
 
 
 @pytest.mark.parametrize(
     ("tokens", "expected_tree"),
     (
-        (
+        pytest.param(
             [
                 Token(TokenType.VAR, "var"),
                 Token(TokenType.IDENTIFIER, "x"),
@@ -242,8 +334,9 @@ def test_parser_expr_files(filename: str, expected_tree: str) -> None:
                     ),
                 ]
             ),
+            id="var_declaration",
         ),
-        (
+        pytest.param(
             [
                 Token(TokenType.VAR, "var"),
                 Token(TokenType.IDENTIFIER, "x"),
@@ -264,8 +357,9 @@ def test_parser_expr_files(filename: str, expected_tree: str) -> None:
                     Print(Variable(Token(TokenType.IDENTIFIER, "x"))),
                 ]
             ),
+            id="print_variable",
         ),
-        (
+        pytest.param(
             [
                 Token(TokenType.IDENTIFIER, "a"),
                 Token(TokenType.EQUAL, "="),
@@ -294,8 +388,9 @@ def test_parser_expr_files(filename: str, expected_tree: str) -> None:
                     ),
                 ],
             ),
+            id="assignment",
         ),
-        (
+        pytest.param(
             [
                 Token(TokenType.VAR, "var"),
                 Token(TokenType.IDENTIFIER, "x"),
@@ -351,8 +446,9 @@ def test_parser_expr_files(filename: str, expected_tree: str) -> None:
                     ),
                 ]
             ),
+            id="block",
         ),
-        (
+        pytest.param(
             [
                 Token(TokenType.IDENTIFIER, "a"),
                 Token(TokenType.DOT, "."),
@@ -405,6 +501,7 @@ def test_parser_expr_files(filename: str, expected_tree: str) -> None:
                     )
                 ]
             ),
+            id="property_chain",
         ),
     ),
 )
@@ -474,13 +571,42 @@ def test_parser(tokens: list[Token], expected_tree: Program) -> None:
         ),
     ),
 )
-def test_parser_files(filename: str, expected_tree: Program) -> None:
-    test_dir = os.path.join(os.path.dirname(__file__), "testdata")
-    filepath = os.path.join(test_dir, filename)
-    source = read_file(filepath)
+def test_parser_files(
+    filename: str,
+    expected_tree: Program,
+    parsed_program: Callable[[str], Program],
+) -> None:
+    assert parsed_program(filename) == expected_tree
 
-    tokens = Lexer(source).tokens
-    parser = Parser(tokens)
-    program, errors = parser.parse()
-    assert not errors
-    assert program == expected_tree
+
+@interpreted_parser_only
+@pytest.mark.parametrize(
+    "filename",
+    sorted(
+        filename
+        for filename in os.listdir(TESTDATA_DIR)
+        # These two fail to lex, so they never reach the parser
+        if filename not in ("fail1.lox", "fail2.lox")
+    ),
+)
+def test_parser_never_backtracks(
+    filename: str,
+    monkeypatch: MonkeyPatch,
+    read_testdata: Callable[[str], str],
+) -> None:
+    """
+    The parser is not memoized, as it never revisits a position: every
+    declaration consumes at least one token.
+    """
+    parse_declaration = Parser.parse_declaration
+
+    def checked(self: Parser) -> Stmt:
+        start = self.index
+        result = parse_declaration(self)
+        assert self.index > start
+        return result
+
+    monkeypatch.setattr(Parser, "parse_declaration", checked)
+
+    source = read_testdata(filename)
+    Parser(Lexer(source).tokens).parse()
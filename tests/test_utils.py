@@ -1,25 +1,44 @@
 from __future__ import annotations
 
+import sys
 from collections import Counter
-from typing import Type
+from typing import Callable, Iterator, List, Tuple, Type
 
 import pytest
+from attr import define
 
-from pylox.lexer import Lexer
+from pylox.lox_types import LoxType
 from pylox.nodes import (
     Binary,
+    Call,
     ClassDef,
+    Expr,
+    ExprStmt,
     FunctionDef,
     Grouping,
     Literal,
     Node,
     Print,
     Program,
+    Stmt,
     VarDeclaration,
     Variable,
 )
 from pylox.parser import Parser
-from pylox.utils import walk
+from pylox.tokens import Token, TokenType
+from pylox.utils import get_lox_type_name, iter_children, walk
+from pylox.visitor import Visitor
+
+
+def iter_node_types(node_type: type[Node] = Node) -> Iterator[type[Node]]:
+    """Yields `node_type` and all of its subclasses."""
+    yield node_type
+    for subclass in node_type.__subclasses__():
+        # attrs replaces every class with a slotted copy, and the original
+        # stays in `__subclasses__()` until it is garbage collected.
+        module_globals = vars(sys.modules[subclass.__module__])
+        if module_globals.get(subclass.__name__, subclass) is subclass:
+            yield from iter_node_types(subclass)
 
 
 @pytest.mark.parametrize(
@@ -49,8 +68,93 @@ from pylox.utils import walk
         ),
     ),
 )
-def test_walk(source: str, nodes: list[Type[Node]]) -> None:
-    tokens = Lexer(source).tokens
+def test_walk(
+    source: str,
+    nodes: list[Type[Node]],
+    lex: Callable[[str], list[Token]],
+) -> None:
+    tokens = lex(source)
     tree, errors = Parser(tokens).parse()
     assert not errors
     assert Counter(type(node) for node in walk(tree)) == Counter(nodes)
+
+
+def test_iter_children(lex: Callable[[str], list[Token]]) -> None:
+    tokens = lex('f("some string", 2);')
+    tree, errors = Parser(tokens).parse()
+    assert not errors
+    (statement,) = tree.body
+    assert isinstance(statement, ExprStmt)
+    call = statement.expression
+    assert isinstance(call, Call)
+    # The callee and argument tuple are yielded, but not the characters of strings.
+    assert list(iter_children(call)) == [call.callee, *call.arguments]
+
+
+def test_visitor_without_init() -> None:
+    class LiteralVisitor(Visitor[str]):
+        def __init__(self, prefix: str) -> None:
+            # No `super().__init__()` call needed
+            self.prefix = prefix
+
+        def visit_Literal(self, literal: Literal) -> str:
+            return self.prefix + self.visit_helper(literal)
+
+        def visit_helper(self, literal: Literal) -> str:
+            return str(literal.value)
+
+    visitor = LiteralVisitor("value: ")
+    assert visitor.generic_visit(Literal(1)) == "value: 1"
+    assert visitor.get_visitor(Variable(Token(TokenType.IDENTIFIER, "x"))) is None
+
+
+@pytest.mark.parametrize("node_type", list(iter_node_types()))
+def test_nodes_are_slotted(node_type: Type[Node]) -> None:
+    # Nodes are created and their fields read all the time, so they must not
+    # have an instance __dict__.
+    assert "__slots__" in node_type.__dict__
+    assert "__dict__" not in node_type.__slots__
+
+
+@pytest.mark.parametrize(
+    ("value", "type_name"),
+    (
+        (None, "nil"),
+        (True, "Boolean"),
+        (False, "Boolean"),
+        (0, "Integer"),
+        (1.0, "Float"),
+        ("", "String"),
+    ),
+)
+def test_get_lox_type_name(value: LoxType, type_name: str) -> None:
+    # Booleans are ints in Python, but must not be named as Integers.
+    assert get_lox_type_name(value) == type_name
+
+
+def test_iter_children_skips_non_nodes(lex: Callable[[str], list[Token]]) -> None:
+    tree, errors = Parser(lex("class A { f(x) { return x; } }")).parse()
+    assert not errors
+    (class_def,) = tree.body
+    assert isinstance(class_def, ClassDef)
+    # The name token and the missing superclass are not children
+    assert list(iter_children(class_def)) == list(class_def.methods)
+    (method,) = class_def.methods
+    # Neither are the parameter tokens
+    assert list(iter_children(method)) == list(method.body)
+
+
+def test_iter_children_any_annotation() -> None:
+    """Children are found by their values, whatever the field annotations say."""
+
+    @define
+    class Pair(Stmt):
+        items: List[Expr]
+        pair: Tuple[Expr, ...]
+        token: Token
+
+    first, second, third = Literal(1), Literal(2), Literal(3)
+    node = Pair([first], (second, third), Token(TokenType.IDENTIFIER, "x"))
+    # Tokens, like function parameters, are not children
+    assert list(iter_children(node)) == [first, second, third]
+    assert Counter(type(node) for node in walk(node)) == {Pair: 1, Literal: 3}